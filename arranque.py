@@ -0,0 +1,25 @@
+import importlib
+import sys
+
+# Las ventanas están en los módulos *_gui.py: main.py, funciona.py, unir.py, v2.py y
+# marisol.py solo las importan al pedir GraphWindow, así quien solo usa el algoritmo (por
+# ejemplo los procesos de lote.py) arranca rápido sin cargar PyQt5 ni matplotlib
+
+
+# __getattr__ de módulo que importa GraphWindow desde gui_module la primera vez que se pide
+def lazy_window(module_name, gui_module):
+    def __getattr__(name):
+        if name == "GraphWindow":
+            return importlib.import_module(gui_module).GraphWindow
+        raise AttributeError("module %r has no attribute %r" % (module_name, name))
+    return __getattr__
+
+
+# Abre la ventana de gui_module y corre la aplicación hasta que se cierre
+def run_window(gui_module):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    window = importlib.import_module(gui_module).GraphWindow()
+    window.show()
+    sys.exit(app.exec_())
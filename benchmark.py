@@ -0,0 +1,287 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+from cargador import load_graph
+from layout import compute_layout
+
+# Benchmark reproducible: genera grafos sintéticos con semilla fija, en el mismo formato
+# {"nodes": [...], "edges": [...]} de los prueba*.json, y mide la carga, el layout y cada
+# implementación del árbol de expansión mínima. El reporte JSON sirve para comparar versiones:
+#
+#   python benchmark.py -o actual.json --baseline anterior.json
+
+SEED = 1234
+SIZES = (100, 1000, 10000, 100000, 1000000)
+KINDS = ("sparse", "dense", "grid", "complete", "power_law")
+DATA_DIR = "benchmark_data"
+
+# Implementaciones a medir como "módulo:atributo"; todas reciben un CSRGraph.
+# Para medir una implementación nueva basta con agregarla aquí
+IMPLEMENTATIONS = (
+    "main:AlgorithPrim.prim_mst",
+    "funciona:prim_mst",
+    "unir:prim_mst",
+    "v2:prim_mst",
+    "marisol:boruvka_mst",
+    "mst:prim_mst",
+    "mst:boruvka_mst",
+    "mst:kruskal_mst",
+)
+
+# El layout es mucho más lento que el resto; por encima de este tamaño no se mide
+LAYOUT_MAX_EDGES = 100000
+
+# Diferencia relativa a partir de la cual un tiempo cuenta como regresión
+TOLERANCE = 0.2
+
+
+# Árbol aleatorio sobre n nodos: cada nodo i > 0 se une a un nodo anterior. Se agrega a
+# los grafos aleatorios para que siempre sean conexos
+def random_tree(num_nodes, rng):
+    targets = np.arange(1, num_nodes)
+    sources = (rng.random(num_nodes - 1) * targets).astype(np.int64)
+    return sources, targets
+
+
+def random_pairs(num_nodes, count, rng):
+    sources = rng.integers(0, num_nodes, count)
+    # El destino se desplaza para no generar lazos (u, u)
+    targets = (sources + rng.integers(1, num_nodes, count)) % num_nodes
+    return sources, targets
+
+
+# Grafo ralo: grado medio cercano a 8
+def generate_sparse(num_edges, rng):
+    num_nodes = max(2, num_edges // 4)
+    tree_sources, tree_targets = random_tree(num_nodes, rng)
+    sources, targets = random_pairs(num_nodes, max(0, num_edges - num_nodes + 1), rng)
+    return (num_nodes, np.concatenate((tree_sources, sources)),
+            np.concatenate((tree_targets, targets)))
+
+
+# Grafo denso: alrededor de la mitad de todos los pares posibles
+def generate_dense(num_edges, rng):
+    num_nodes = max(2, int(round((4 * num_edges) ** 0.5)))
+    tree_sources, tree_targets = random_tree(num_nodes, rng)
+    sources, targets = random_pairs(num_nodes, max(0, num_edges - num_nodes + 1), rng)
+    return (num_nodes, np.concatenate((tree_sources, sources)),
+            np.concatenate((tree_targets, targets)))
+
+
+# Cuadrícula de side x side con aristas horizontales y verticales
+def generate_grid(num_edges, rng):
+    side = max(2, int(round((num_edges / 2) ** 0.5)))
+    ids = np.arange(side * side).reshape(side, side)
+    sources = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    targets = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+    return side * side, sources, targets
+
+
+# Grafo completo con n(n - 1) / 2 aristas
+def generate_complete(num_edges, rng):
+    num_nodes = max(2, int(round((2 * num_edges) ** 0.5)) + 1)
+    sources, targets = np.triu_indices(num_nodes, k=1)
+    return num_nodes, sources, targets
+
+
+# Barabási–Albert: cada nodo nuevo se une a 3 nodos elegidos con probabilidad proporcional
+# a su grado, lo que da una distribución de grados de ley de potencias
+def generate_power_law(num_edges, rng, links=3):
+    num_nodes = max(links + 1, num_edges // links + 1)
+    # Cada nodo aparece en repeated tantas veces como su grado
+    repeated = list(range(links))
+    sources = []
+    targets = []
+    for node in range(links, num_nodes):
+        chosen = set()
+        while len(chosen) < links:
+            chosen.update(repeated[i] for i in
+                          rng.integers(0, len(repeated), links - len(chosen)).tolist())
+        for other in chosen:
+            sources.append(node)
+            targets.append(other)
+        repeated.extend(chosen)
+        repeated.extend([node] * links)
+    return num_nodes, np.array(sources), np.array(targets)
+
+
+GENERATORS = {
+    "sparse": generate_sparse,
+    "dense": generate_dense,
+    "grid": generate_grid,
+    "complete": generate_complete,
+    "power_law": generate_power_law,
+}
+
+
+# Escribe el grafo en el esquema {"nodes": [{"id"}], "edges": [{"source", "target", "weight"}]}
+def write_graph(file_path, num_nodes, sources, targets, weights):
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        file.write('{"nodes": [')
+        file.write(", ".join('{"id": %d}' % node for node in range(num_nodes)))
+        file.write('], "edges": [')
+        file.write(", ".join('{"source": %d, "target": %d, "weight": %r}' % edge
+                             for edge in zip(sources.tolist(), targets.tolist(),
+                                             weights.tolist())))
+        file.write("]}\n")
+    os.replace(tmp_path, file_path)
+
+
+# Genera (o reutiliza, si ya existe) el archivo de un tipo y tamaño; la semilla depende del
+# tipo y del tamaño, así cada archivo es el mismo en cualquier máquina
+def graph_file(kind, num_edges, seed=SEED, data_dir=DATA_DIR):
+    file_path = os.path.join(data_dir, "%s-%d-%d.json" % (kind, num_edges, seed))
+    if os.path.exists(file_path):
+        return file_path
+
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng([seed, KINDS.index(kind), num_edges])
+    num_nodes, sources, targets = GENERATORS[kind](num_edges, rng)
+    weights = np.round(rng.uniform(1, 100, len(sources)), 2)
+    write_graph(file_path, num_nodes, sources, targets, weights)
+    return file_path
+
+
+def resolve(name):
+    module_name, attribute = name.split(":")
+    target = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
+
+
+# Corre function repeat veces y devuelve los tiempos en segundos y el último resultado
+def measure(function, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def record(results, graph_name, kind, graph, stage, times, **extra):
+    entry = {
+        "graph": graph_name,
+        "kind": kind,
+        "nodes": graph.num_nodes,
+        "edges": graph.num_edges,
+        "stage": stage,
+        "seconds": times,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+    entry.update(extra)
+    results.append(entry)
+    print("%-28s %-28s %10.4f s" % (graph_name, stage, entry["min"]), file=sys.stderr)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(kinds=KINDS, sizes=SIZES, implementations=IMPLEMENTATIONS, repeat=3, seed=SEED,
+        data_dir=DATA_DIR, layout_max_edges=LAYOUT_MAX_EDGES):
+    functions = [(name, resolve(name)) for name in implementations]
+    results = []
+
+    for kind in kinds:
+        for num_edges in sizes:
+            file_path = graph_file(kind, num_edges, seed, data_dir)
+            graph_name = os.path.basename(file_path)[:-len(".json")]
+
+            times, graph = measure(lambda: load_graph(file_path), repeat)
+            record(results, graph_name, kind, graph, "load", times)
+
+            if graph.num_edges <= layout_max_edges:
+                # Una sola corrida: el layout es determinista y domina el tiempo total
+                times, _ = measure(lambda: compute_layout(graph), 1)
+                record(results, graph_name, kind, graph, "layout", times)
+
+            for name, function in functions:
+                times, tree = measure(lambda: function(graph), repeat)
+                record(results, graph_name, kind, graph, name, times, tree_size=len(tree))
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# Compara con un reporte anterior usando el mínimo de cada medición; devuelve las
+# mediciones que empeoraron más que tolerance
+def regressions(report, baseline, tolerance=TOLERANCE):
+    previous = {(entry["graph"], entry["stage"]): entry for entry in baseline["results"]}
+    slower = []
+    for entry in report["results"]:
+        old = previous.get((entry["graph"], entry["stage"]))
+        if old is not None and entry["min"] > old["min"] * (1 + tolerance):
+            slower.append((entry["graph"], entry["stage"], old["min"], entry["min"]))
+    return slower
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mide carga, layout y árbol de expansión mínima sobre grafos sintéticos.")
+    parser.add_argument("-k", "--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("-s", "--sizes", nargs="+", type=lambda text: int(float(text)),
+                        default=list(SIZES), help="cantidad aproximada de aristas (1e2 ... 1e6)")
+    parser.add_argument("-i", "--implementations", nargs="+", default=list(IMPLEMENTATIONS),
+                        help="implementaciones como módulo:atributo")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="directorio de los grafos generados (se reutilizan)")
+    parser.add_argument("--layout-max-edges", type=int, default=LAYOUT_MAX_EDGES)
+    parser.add_argument("-o", "--output", help="archivo del reporte JSON (por defecto, la salida estándar)")
+    parser.add_argument("--baseline", help="reporte anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args.kinds, args.sizes, args.implementations, args.repeat, args.seed,
+                 args.data_dir, args.layout_max_edges)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            slower = regressions(report, json.load(file), args.tolerance)
+        for graph_name, stage, old, new in slower:
+            print("Regresión: %s %s %.4f s -> %.4f s" % (graph_name, stage, old, new),
+                  file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from grafo import CSRGraph
+from cargador import load_graph_file
+
+# Directorio base de los cachés en disco del proyecto
+CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "sistemas_inteligentes")
+
+# Tamaño máximo del caché de grafos; al pasarse se borran las entradas usadas hace más tiempo
+MAX_CACHE_BYTES = 4 << 30
+
+HASH_CHUNK_SIZE = 1 << 22
+
+# Versión del cargador: cambia cuando los mismos bytes se leen distinto (otro esquema, otro
+# campo de peso), así no se usan grafos viejos del disco
+LOADER_VERSION = 4
+
+# Arreglos del CSRGraph que se guardan, cada uno en su propio .npy (se abren con mmap)
+ARRAYS = ("sources", "targets", "weights", "offsets", "neighbors", "edge_index")
+
+
+# Hash del contenido del archivo, leído por bloques
+def file_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Caché binario de grafos: la primera carga de un archivo guarda el CSRGraph en disco y las
+# siguientes lo abren con mmap sin volver a leer el JSON o la lista de aristas
+class GraphCache:
+    def __init__(self, cache_dir=None, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir or os.path.join(CACHE_ROOT, "grafos")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def read_index(self):
+        try:
+            with open(self.index_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def write_index(self, index):
+        # Escritura atómica para que otros procesos nunca lean un índice a medias
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w") as file:
+            json.dump(index, file)
+        os.replace(tmp_path, self.index_path)
+
+    # Hash del archivo fuente. El índice recuerda (tamaño, mtime) de cada ruta para no
+    # releer archivos que no cambiaron; si cambian se vuelve a calcular el hash y la
+    # entrada anterior queda huérfana hasta que la borre el desalojo
+    def source_hash(self, file_path):
+        stat = os.stat(file_path)
+        path = os.path.abspath(file_path)
+
+        index = self.read_index()
+        entry = index.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["hash"]
+
+        digest = file_hash(file_path)
+        index[path] = {"size": stat.st_size,
+                       "mtime_ns": stat.st_mtime_ns, "hash": digest}
+        self.write_index(index)
+        return digest
+
+    def entry_path(self, digest, weight, default_weight):
+        key = "%s-%s-v%d" % (digest, weight, LOADER_VERSION)
+        if default_weight is not None:
+            key += "-%r" % default_weight
+        return os.path.join(self.cache_dir, key)
+
+    # El grafo lleva como source_key el nombre de su entrada (hash del archivo, campo de peso
+    # y versión del cargador): así el caché de árboles lo reconoce sin volver a hashearlo
+    def load(self, file_path, weight="weight", default_weight=None):
+        path = self.entry_path(self.source_hash(file_path), weight, default_weight)
+
+        if os.path.isdir(path):
+            try:
+                graph = self.read(path)
+                # Marca la entrada como usada recientemente para el desalojo
+                os.utime(path)
+                graph.source_key = os.path.basename(path)
+                return graph
+            except (OSError, ValueError):
+                # Entrada dañada: se descarta y se reconstruye desde el JSON
+                shutil.rmtree(path, ignore_errors=True)
+
+        graph = load_graph_file(file_path, weight=weight,
+                                default_weight=default_weight)
+        try:
+            self.write(path, graph)
+            self.evict()
+        except OSError:
+            # Sin permisos o sin espacio: se trabaja sin caché
+            pass
+        graph.source_key = os.path.basename(path)
+        return graph
+
+    def read(self, path):
+        arrays = [np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+                  for name in ARRAYS]
+        node_ids = np.load(os.path.join(path, "node_ids.npy")).tolist()
+        sources, targets, weights, offsets, neighbors, edge_index = arrays
+        return CSRGraph(node_ids, sources, targets, weights,
+                        adjacency=(offsets, neighbors, edge_index))
+
+    def write(self, path, graph):
+        # La tabla de ids se guarda como arreglo de texto o de enteros; con ids de tipos
+        # mezclados no se puede guardar sin perder el tipo y el grafo no se cachea
+        if all(isinstance(node, str) for node in graph.node_ids):
+            node_ids = np.array(graph.node_ids, dtype=str)
+        elif all(isinstance(node, int) and not isinstance(node, bool) for node in graph.node_ids):
+            node_ids = np.array(graph.node_ids, dtype=np.int64)
+        else:
+            return
+
+        # Se escribe en un directorio temporal y se renombra al final
+        tmp_path = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            np.save(os.path.join(tmp_path, "node_ids.npy"), node_ids)
+            for name in ARRAYS:
+                np.save(os.path.join(tmp_path, name + ".npy"),
+                        getattr(graph, name))
+            os.rename(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            # Otro proceso pudo haber escrito la misma entrada primero
+            if not os.path.isdir(path):
+                raise
+
+    # Desalojo por tamaño: se borran las entradas menos usadas hasta quedar bajo max_bytes
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.stat(path).st_mtime, size, path))
+            total += size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+        # Las rutas que ya no existen se quitan del índice
+        index = self.read_index()
+        alive = {path: entry for path, entry in index.items()
+                 if os.path.exists(path)}
+        if len(alive) != len(index):
+            self.write_index(alive)
+
+
+default_cache = None
+
+
+# Carga un archivo de grafo (JSON o lista de aristas) pasando por el caché compartido
+def load_graph_cached(file_path, weight="weight", default_weight=None):
+    global default_cache
+
+    if default_cache is None:
+        try:
+            default_cache = GraphCache()
+        except OSError:
+            return load_graph_file(file_path, weight=weight, default_weight=default_weight)
+
+    return default_cache.load(file_path, weight=weight, default_weight=default_weight)
@@ -0,0 +1,259 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+import numpy as np
+from cache_grafo import CACHE_ROOT
+from grafo import EDGE
+import mst
+
+# Tamaño máximo del caché de árboles en disco; al pasarse se borran los usados hace más tiempo
+MAX_CACHE_BYTES = 256 << 20
+
+# Árboles que se guardan en memoria (los de uso más reciente)
+MEMORY_ENTRIES = 32
+
+# Versión de los resultados guardados: cambia cuando un algoritmo cambia lo que devuelve
+# (por ejemplo, Prim pasó a devolver un bosque con los grafos no conexos), así no se usan
+# árboles viejos del disco
+RESULTS_VERSION = 3
+
+# Aristas por paso al recorrer por pasos un árbol que ya estaba en el caché
+STREAM_CHUNK = 4096
+
+
+# Orden canónico de los nodos: el mismo grafo con los nodos o las aristas en otro orden da
+# el mismo hash. Devuelve los ids ordenados como arreglo y el rango de cada índice del grafo
+def canonical_nodes(node_ids):
+    if all(isinstance(node, str) for node in node_ids):
+        ids = np.array(node_ids, dtype=str)
+    elif all(isinstance(node, int) and not isinstance(node, bool) for node in node_ids):
+        ids = np.array(node_ids, dtype=np.int64)
+    else:
+        # Ids de tipos mezclados: se ordenan por tipo y texto
+        ids = np.array(["%s:%r" % (type(node).__name__, node) for node in node_ids], dtype=str)
+
+    order = np.argsort(ids, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return ids[order], order, rank
+
+
+# Hash del contenido del grafo (nodos, aristas y pesos) y el orden canónico de sus nodos
+def graph_hash(graph):
+    ids, order, rank = canonical_nodes(graph.node_ids)
+
+    # Cada arista con sus extremos en orden canónico (menor, mayor), ordenadas por extremos y,
+    # solo si hay aristas paralelas, también por peso (lexsort es bastante más lento)
+    sources = rank[graph.sources]
+    targets = rank[graph.targets]
+    low = np.minimum(sources, targets)
+    high = np.maximum(sources, targets)
+    pairs = low * len(ids) + high
+    edges = np.argsort(pairs, kind="stable")
+    sorted_pairs = pairs[edges]
+    if np.any(sorted_pairs[1:] == sorted_pairs[:-1]):
+        edges = np.lexsort((graph.weights, pairs))
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(ids.dtype.str.encode())
+    digest.update(ids.tobytes())
+    for array in (low[edges], high[edges], graph.weights[edges]):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest(), order, rank
+
+
+# Clave del grafo en el caché y traducción de sus índices de nodo: un grafo cargado por el
+# caché de grafos usa el nombre de esa entrada y sus propios índices (order y rank None),
+# sin ningún cálculo; los demás, el hash de graph_hash, que se guarda en el grafo. Así el
+# primer paso del árbol no espera un ordenamiento de todas las aristas
+def graph_key(graph):
+    if graph.source_key is not None:
+        return "file-" + graph.source_key, None, None
+    if graph.content_hash is None:
+        graph.content_hash = graph_hash(graph)
+    return graph.content_hash
+
+
+def algorithm_name(algorithm):
+    return "%s.%s" % (algorithm.__module__, algorithm.__qualname__)
+
+
+# Caché de árboles de expansión mínima por contenido: la clave es el hash del grafo más el
+# nombre del algoritmo, así reabrir el mismo archivo (o el mismo grafo con otro orden) no
+# recalcula nada. Los árboles se guardan con los índices canónicos de los nodos y se
+# traducen a los índices del grafo que se consulta. Con cache_dir se agrega un nivel en
+# disco (un .npz por árbol) compartido entre procesos
+class MSTCache:
+    def __init__(self, cache_dir=None, max_bytes=MAX_CACHE_BYTES, max_entries=MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # Los bosques calculados por componente (forest) tienen las aristas agrupadas por
+    # componente y no en el orden del algoritmo: se guardan con otra clave
+    def key(self, digest, algorithm, forest=False):
+        return "%s-%s%s-v%d" % (digest, algorithm_name(algorithm), "-forest" if forest else "",
+                                RESULTS_VERSION)
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    # Calcula el árbol con algorithm(graph, progress) o lo toma del caché; con workers > 1 se
+    # calcula por componente en varios procesos (mst.minimum_spanning_forest).
+    # Devuelve (arreglo EDGE con índices del grafo, peso total)
+    def compute(self, graph, algorithm, progress=None, workers=1):
+        digest, order, rank = graph_key(graph)
+        key = self.key(digest, algorithm, forest=workers > 1)
+
+        entry = self.get(key)
+        if entry is None:
+            if workers > 1:
+                tree, _ = mst.minimum_spanning_forest(graph, algorithm, workers, progress)
+            else:
+                tree = algorithm(graph, progress)
+            entry = self.entry(tree, rank)
+            self.put(key, entry)
+        else:
+            tree = self.tree(entry, order)
+        return tree, float(entry[2].sum())
+
+    # Igual que compute pero por pasos, para animar el árbol mientras se calcula: si no está
+    # en el caché se recorre la versión por pasos del algoritmo (mst.STEPS) y el árbol se
+    # guarda al terminar; si está, sus aristas salen de a STREAM_CHUNK. Los pasos se juntan
+    # en arreglos EDGE de a STREAM_CHUNK aristas y se concatenan una sola vez al final
+    def stream(self, graph, algorithm, progress=None):
+        # Un grafo sin clave todavía (armado en memoria, por ejemplo al editarlo) no se busca:
+        # los pasos salen enseguida y el hash se calcula al final, solo para guardar el árbol
+        if graph.source_key is not None or graph.content_hash is not None:
+            digest, order, rank = graph_key(graph)
+            entry = self.get(self.key(digest, algorithm))
+            if entry is not None:
+                tree = self.tree(entry, order)
+                for start in range(0, len(tree), STREAM_CHUNK):
+                    yield tree[start:start + STREAM_CHUNK].tolist()
+                return
+
+        parts = []
+        pending = []
+        for step in mst.STEPS[algorithm](graph, progress):
+            pending.extend(step)
+            if len(pending) >= STREAM_CHUNK:
+                parts.append(np.array(pending, dtype=EDGE))
+                pending = []
+            yield step
+        parts.append(np.array(pending, dtype=EDGE))
+        digest, order, rank = graph_key(graph)
+        self.put(self.key(digest, algorithm), self.entry(np.concatenate(parts), rank))
+
+    # Árbol (arreglo EDGE o lista de tuplas) con los índices canónicos de los nodos, como se
+    # guarda en el caché; sin rank los índices del grafo ya son los canónicos
+    def entry(self, tree, rank):
+        tree = np.asarray(tree, dtype=EDGE)
+        if rank is None:
+            return tree["source"].copy(), tree["target"].copy(), tree["weight"].copy()
+        return rank[tree["source"]], rank[tree["target"]], tree["weight"].copy()
+
+    # Arreglo EDGE de una entrada del caché con los índices del grafo consultado
+    def tree(self, entry, order):
+        sources, targets, weights = entry
+        tree = np.empty(len(weights), dtype=EDGE)
+        tree["source"] = sources if order is None else order[sources]
+        tree["target"] = targets if order is None else order[targets]
+        tree["weight"] = weights
+        return tree
+
+    def get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            return entry
+
+        if self.cache_dir is None:
+            return None
+        path = self.entry_path(key)
+        try:
+            with np.load(path) as data:
+                entry = (data["sources"], data["targets"], data["weights"])
+            # Marca la entrada como usada recientemente para el desalojo
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        self.remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self.remember(key, entry)
+        if self.cache_dir is None:
+            return
+
+        sources, targets, weights = entry
+        try:
+            # Se escribe en un archivo temporal y se renombra, así otro proceso nunca lee
+            # un árbol a medias
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as file:
+                np.savez(file, sources=sources, targets=targets, weights=weights)
+            os.replace(tmp_path, self.entry_path(key))
+            self.evict()
+        except OSError:
+            # Sin permisos o sin espacio: el árbol queda solo en memoria
+            pass
+
+    def remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    # Desalojo por tamaño: se borran los árboles menos usados hasta quedar bajo max_bytes
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".") or not entry.name.endswith(".npz"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+default_cache = None
+
+
+# Caché compartido (memoria y disco) de las ventanas y de lote.py
+def shared_cache():
+    global default_cache
+
+    if default_cache is None:
+        try:
+            default_cache = MSTCache(os.path.join(CACHE_ROOT, "mst"))
+        except OSError:
+            default_cache = MSTCache()
+    return default_cache
+
+
+# Árbol de expansión mínima pasando por el caché compartido, en workers procesos si hace
+# falta calcularlo. Devuelve (arreglo EDGE con índices del grafo, peso total)
+def cached_mst(graph, algorithm, progress=None, workers=1):
+    return shared_cache().compute(graph, algorithm, progress, workers)
+
+
+# Pasos del árbol de expansión mínima (listas de aristas con índices del grafo) pasando por
+# el caché compartido
+def stream_mst(graph, algorithm, progress=None):
+    return shared_cache().stream(graph, algorithm, progress)
@@ -0,0 +1,423 @@
+import json
+import mmap
+import os
+import re
+import warnings
+import numpy as np
+from grafo import CSRGraph, GraphBuilder, NODE_SECTIONS, EDGE_SECTIONS
+
+# Bytes de texto que se leen del archivo en cada lectura
+CHUNK_SIZE = 1 << 20
+
+# Cantidad de nodos o aristas que se entregan juntos al GraphBuilder
+BATCH_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"\s*")
+
+# Listas de aristas de texto: una arista por línea, "origen destino [peso]", separadas por
+# espacios, tabuladores, comas o punto y coma. Las líneas vacías, los comentarios (desde un #
+# al principio de la línea o después de un separador) y una fila de encabezado opcional se
+# saltan
+EDGE_LIST_EXTENSIONS = (".csv", ".tsv", ".txt", ".edges")
+SEPARATORS = bytes.maketrans(b",;\t\r", b"    ")
+HEADER_NAMES = {b"source", b"target", b"inicio", b"fin", b"u", b"v", b"from", b"to"}
+COMMENT = re.compile(rb"(?:^|(?<=[ ,;\t\r]))#[^\n]*", re.MULTILINE)
+SPACES = re.compile(rb"  +")
+LINE_BREAKS = re.compile(rb" \n[ \n]*|\n[ \n]+")
+
+# Bytes de la lista de aristas que se convierten juntos (cortados en un fin de línea)
+EDGE_LIST_CHUNK_SIZE = 1 << 24
+
+# Lista de aristas binaria: registros de 16 bytes sin encabezado, origen y destino int32 y
+# peso float64, little-endian. Los nodos son los enteros 0..max
+BINARY_EXTENSIONS = (".bin",)
+BINARY_EDGE = np.dtype([("source", "<i4"), ("target", "<i4"), ("weight", "<f8")])
+
+# Filtro de los diálogos de las ventanas para abrir cualquiera de los formatos
+FILE_FILTER = ("Graphs (*.json *.csv *.tsv *.txt *.edges *.bin);;JSON Files (*.json);;"
+               "Edge lists (*.csv *.tsv *.txt *.edges);;Binary edge lists (*.bin)")
+
+
+# Lector incremental de JSON: mantiene en memoria solo un trozo del texto y decodifica
+# un valor a la vez con JSONDecoder.raw_decode
+class JsonStream:
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # Se descarta lo ya consumido para que el buffer no crezca con el archivo
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # Devuelve el siguiente carácter significativo sin consumirlo ("" al final del archivo)
+    def peek(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(
+                "Expecting '%s'" % char, self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # El valor puede estar cortado al final del buffer
+                if self.eof or not self.fill():
+                    raise
+                continue
+
+            # Un número al final del buffer podría seguir en el siguiente trozo
+            if end < len(self.buffer) or self.eof or not self.fill():
+                self.pos = end
+                return value
+
+    # Recorre los elementos de un arreglo JSON uno por uno
+    def items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("]")
+                return
+
+    # Recorre las claves de un objeto JSON; quien llama debe consumir cada valor
+    def keys(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("}")
+                return
+
+
+def batches(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Recorre las claves de un objeto; las secciones de nodos y aristas se envían por lotes y
+# "grafo" (el esquema en español) se recorre como un objeto más. Devuelve los nombres de las
+# secciones encontradas
+def read_sections(stream, sections):
+    found = set()
+    for key in stream.keys():
+        if key in sections:
+            found.add(key)
+            for batch in batches(stream.items()):
+                sections[key](batch)
+        elif key == "grafo":
+            found |= read_sections(stream, sections)
+        else:
+            # Cualquier otra clave se lee y se descarta
+            stream.value()
+    return found
+
+
+# Carga un archivo de grafo en un CSRGraph en una sola pasada y sin leer todo el JSON:
+# los arreglos se recorren elemento por elemento y se envían al GraphBuilder por lotes.
+# Acepta {"nodes", "edges"} con weight o distance y {"grafo": {"nodos", "aristas"}}; un
+# archivo sin ninguna de esas secciones es un error (y no un grafo vacío)
+def load_graph(file_path, weight="weight", default_weight=None, chunk_size=CHUNK_SIZE):
+    builder = GraphBuilder(weight, default_weight)
+    sections = dict.fromkeys(NODE_SECTIONS, builder.add_nodes)
+    sections.update(dict.fromkeys(EDGE_SECTIONS, builder.add_edges))
+
+    with open(file_path, "r") as file:
+        found = read_sections(JsonStream(file, chunk_size), sections)
+
+    if not found:
+        raise ValueError("No se encontró ninguna sección de nodos o aristas (%s)"
+                         % ", ".join(NODE_SECTIONS + EDGE_SECTIONS))
+    return builder.build()
+
+
+def is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def is_integer(token):
+    try:
+        int(token)
+    except ValueError:
+        return False
+    return True
+
+
+# Salta comentarios y encabezado. Devuelve dónde empiezan los datos, la cantidad de columnas
+# y si los ids de los nodos son enteros (entonces se convierten con NumPy sin pasar por Python)
+def edge_list_header(data):
+    pos = 0
+    header_seen = False
+    while pos < len(data):
+        end = data.find(b"\n", pos)
+        end = len(data) if end == -1 else end + 1
+        tokens = COMMENT.sub(b"", data[pos:end]).translate(SEPARATORS).split()
+        if not tokens:
+            pos = end
+            continue
+        if len(tokens) < 2:
+            raise ValueError("Se esperaban columnas origen destino [peso]: %r" % data[pos:end])
+
+        # La primera fila es encabezado si nombra las columnas o si su peso no es un número
+        if not header_seen and (tokens[0].lower() in HEADER_NAMES or
+                                len(tokens) > 2 and not is_number(tokens[2])):
+            header_seen = True
+            pos = end
+            continue
+        return pos, len(tokens), is_integer(tokens[0]) and is_integer(tokens[1])
+    return pos, 3, True
+
+
+# Un id que no es un número en un archivo cuyos ids parecían enteros: se vuelve a leer todo
+# con ids de texto
+class NonNumericIds(Exception):
+    pass
+
+
+# Trozo sin comentarios ni líneas vacías, con un solo espacio entre valores y un fin de línea
+# entre líneas de datos. Las expresiones regulares solo corren si hace falta: dos espacios o
+# fines de línea seguidos se buscan con NumPy, mucho más rápido
+def clean_edge_chunk(chunk):
+    if b"#" in chunk:
+        chunk = COMMENT.sub(b"", chunk)
+    chunk = chunk.translate(SEPARATORS)
+    chars = np.frombuffer(chunk, dtype=np.uint8)
+    blank = (chars == ord(" ")) | (chars == ord("\n"))
+    if (blank[1:] & blank[:-1]).any():
+        chunk = LINE_BREAKS.sub(b"\n", SPACES.sub(b" ", chunk))
+    return chunk.strip(b" \n")
+
+
+# Error con el número de línea de la primera línea cuyo peso no es un número finito
+def weight_error(chunk, first_line):
+    for number, line in enumerate(chunk.split(b"\n"), first_line):
+        tokens = clean_edge_chunk(line).split()
+        if len(tokens) > 2 and not np.isfinite(parse_weight(tokens[2])):
+            return ValueError("Línea %d: el peso no es un número finito: %r" % (number, line))
+    return ValueError("Hay pesos que no son números finitos")
+
+
+def parse_weight(token):
+    try:
+        return float(token)
+    except ValueError:
+        return float("nan")
+
+
+# Cantidad de valores de cada línea de un trozo limpio, contando espacios entre fines de
+# línea con NumPy (sin un objeto por línea)
+def line_columns(text):
+    chars = np.frombuffer(text, dtype=np.uint8)
+    spaces = np.flatnonzero(chars == ord(" "))
+    breaks = np.searchsorted(spaces, np.flatnonzero(chars == ord("\n")))
+    return np.diff(np.concatenate(([0], breaks, [len(spaces)]))) + 1
+
+
+# Error con el número de línea (en el archivo) de la primera línea con otra cantidad de
+# columnas; solo se busca cuando hay una
+def column_error(chunk, columns, first_line):
+    for number, line in enumerate(chunk.split(b"\n"), first_line):
+        tokens = clean_edge_chunk(line).split()
+        if tokens and len(tokens) != columns:
+            return ValueError("Línea %d: se esperaban %d columnas: %r" % (number, columns, line))
+    return ValueError("Las líneas de la lista de aristas no tienen %d columnas" % columns)
+
+
+# Convierte un trozo de líneas completas en columnas de origen, destino y peso. first_line es
+# el número de línea del archivo donde empieza el trozo, para los mensajes de error. Los
+# pesos deben ser números finitos: con NaN o infinito los algoritmos no coinciden
+def parse_edge_chunk(chunk, columns, numeric, default_weight, first_line=1):
+    text = clean_edge_chunk(chunk)
+    if not text:
+        values = np.empty((0, columns)) if numeric else np.empty((0, columns), dtype="S1")
+    else:
+        counts = line_columns(text)
+        if (counts != columns).any():
+            raise column_error(chunk, columns, first_line)
+
+        if numeric:
+            # Un id que no es un número corta la lectura: NumPy 2 lanza un error y las
+            # versiones viejas solo un aviso, que se vuelve error
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error", DeprecationWarning)
+                    values = np.fromstring(text, sep=" ")
+            except (ValueError, DeprecationWarning):
+                raise NonNumericIds()
+            if len(values) != len(counts) * columns:
+                raise NonNumericIds()
+        else:
+            values = np.array(text.split())
+
+    values = values.reshape(-1, columns)
+    if numeric:
+        ids = values[:, :2]
+        if not (np.isfinite(ids) & (ids == np.floor(ids))).all():
+            raise NonNumericIds()
+        sources = values[:, 0].astype(np.int64)
+        targets = values[:, 1].astype(np.int64)
+    else:
+        sources = values[:, 0]
+        targets = values[:, 1]
+
+    if columns > 2:
+        try:
+            weights = values[:, 2].astype(np.float64)
+        except ValueError:
+            raise weight_error(chunk, first_line)
+        if not np.isfinite(weights).all():
+            raise weight_error(chunk, first_line)
+    else:
+        weights = np.full(len(values), default_weight, dtype=np.float64)
+    return sources, targets, weights
+
+
+# Columnas de cada trozo de la lista de aristas desde la posición start (cortes en un fin de
+# línea)
+def read_edge_chunks(data, start, columns, numeric, default_weight, chunk_size):
+    parts = []
+    pos = start
+    line = data[:start].count(b"\n") + 1
+    while pos < len(data):
+        end = data.find(b"\n", pos + chunk_size)
+        end = len(data) if end == -1 else end + 1
+        chunk = data[pos:end]
+        parts.append(parse_edge_chunk(chunk, columns, numeric, default_weight, line))
+        line += chunk.count(b"\n")
+        pos = end
+    return parts
+
+
+# Carga una lista de aristas de texto (CSV, TSV o separada por espacios) con el archivo
+# mapeado en memoria: se convierte por trozos grandes con NumPy, sin un objeto por arista.
+# Sin columna de peso las aristas pesan default_weight (1 si no se indica)
+def load_edge_list(file_path, default_weight=None, chunk_size=EDGE_LIST_CHUNK_SIZE):
+    if default_weight is None:
+        default_weight = 1.0
+
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return CSRGraph([], [], [], [])
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start, columns, numeric = edge_list_header(data)
+            try:
+                parts = read_edge_chunks(data, start, columns, numeric, default_weight,
+                                         chunk_size)
+            except NonNumericIds:
+                numeric = False
+                parts = read_edge_chunks(data, start, columns, numeric, default_weight,
+                                         chunk_size)
+
+    if not parts:
+        return CSRGraph([], [], [], [])
+    sources, targets, weights = (np.concatenate(column) for column in zip(*parts))
+    del parts
+
+    # Los ids distintos, ordenados, pasan a ser los nodos 0..n-1. Con ids enteros pequeños
+    # (lo habitual) una tabla directa evita ordenar todos los extremos con np.unique
+    ids = np.concatenate((sources, targets))
+    del sources, targets
+    if numeric and len(ids) and ids.min() >= 0 and ids.max() < 4 * len(ids):
+        present = np.zeros(int(ids.max()) + 1, dtype=bool)
+        present[ids] = True
+        node_ids = np.flatnonzero(present)
+        inverse = (np.cumsum(present, dtype=np.int32) - 1)[ids]
+    else:
+        node_ids, inverse = np.unique(ids, return_inverse=True)
+        inverse = inverse.astype(np.int32)
+    del ids
+    num_edges = len(weights)
+    node_ids = node_ids.tolist() if numeric else [node.decode() for node in node_ids.tolist()]
+    return CSRGraph(node_ids, inverse[:num_edges], inverse[num_edges:], weights)
+
+
+# Carga una lista de aristas binaria mapeando el archivo con np.memmap; los pesos deben ser
+# números finitos
+def load_binary_edges(file_path):
+    if os.path.getsize(file_path) % BINARY_EDGE.itemsize:
+        raise ValueError("El tamaño del archivo no es múltiplo de %d bytes" % BINARY_EDGE.itemsize)
+    if os.path.getsize(file_path) == 0:
+        return CSRGraph([], [], [], [])
+
+    edges = np.memmap(file_path, dtype=BINARY_EDGE, mode="r")
+    sources = np.ascontiguousarray(edges["source"])
+    targets = np.ascontiguousarray(edges["target"])
+    weights = np.ascontiguousarray(edges["weight"])
+    del edges
+
+    finite = np.isfinite(weights)
+    if not finite.all():
+        record = int(np.argmin(finite))
+        raise ValueError("Registro %d: el peso %r no es un número finito"
+                         % (record + 1, float(weights[record])))
+
+    num_nodes = int(max(sources.max(), targets.max())) + 1
+    if min(sources.min(), targets.min()) < 0:
+        raise ValueError("Los ids de los nodos deben ser enteros no negativos")
+    return CSRGraph(range(num_nodes), sources, targets, weights)
+
+
+# Guarda aristas en el formato binario de load_binary_edges
+def save_binary_edges(file_path, sources, targets, weights):
+    edges = np.empty(len(weights), dtype=BINARY_EDGE)
+    edges["source"] = sources
+    edges["target"] = targets
+    edges["weight"] = weights
+    edges.tofile(file_path)
+
+
+# Elige el lector según la extensión: lista binaria, lista de texto o JSON
+def load_graph_file(file_path, weight="weight", default_weight=None):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in BINARY_EXTENSIONS:
+        return load_binary_edges(file_path)
+    if extension in EDGE_LIST_EXTENSIONS:
+        return load_edge_list(file_path, default_weight=default_weight)
+    return load_graph(file_path, weight=weight, default_weight=default_weight)
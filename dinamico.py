@@ -0,0 +1,286 @@
+from collections import deque
+import numpy as np
+from grafo import CSRGraph, EDGE
+from mst import DisjointSet, connected_components
+
+
+# Árbol (o bosque) de expansión mínima que se mantiene al editar el grafo, sin recalcularlo:
+#  - al agregar una arista (o bajar su peso) se busca el camino del árbol entre sus extremos;
+#    si la arista es más barata que la más pesada del ciclo, la reemplaza
+#  - al quitar una arista del árbol (o subir su peso) el árbol se parte en dos y se elige la
+#    arista más barata que cruza ese corte
+# Los nodos usan los mismos índices que el CSRGraph de origen; las aristas tienen un id que
+# no cambia (las quitadas quedan marcadas como muertas)
+class DynamicMST:
+    def __init__(self, graph, tree=None):
+        self.node_ids = list(graph.node_ids)
+        self.index = dict(graph.index)
+
+        self.num_edges = graph.num_edges
+        capacity = max(16, 2 * self.num_edges)
+        self.sources = np.empty(capacity, dtype=np.int64)
+        self.targets = np.empty(capacity, dtype=np.int64)
+        self.weights = np.empty(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.sources[:self.num_edges] = graph.sources
+        self.targets[:self.num_edges] = graph.targets
+        self.weights[:self.num_edges] = graph.weights
+        self.alive[:self.num_edges] = True
+
+        # Aristas del árbol en el orden de la animación (un dict conserva el orden) y
+        # adyacencia del árbol: tree_adjacency[u][v] = id de la arista. Sin árbol solo se
+        # editan las aristas
+        self.tree = None
+        self.tree_adjacency = {}
+        if tree is not None:
+            self.tree = {}
+            num_components, _ = connected_components(graph)
+            self.set_tree(tree, graph.num_nodes - num_components)
+
+    # Ubica cada arista (origen, destino, peso) del árbol calculado entre las del grafo; el
+    # árbol puede ser un arreglo EDGE o una lista de tuplas. forest_size es la cantidad de
+    # aristas de un bosque de expansión del grafo (nodos menos componentes)
+    def set_tree(self, tree, forest_size):
+        tree = np.asarray(tree, dtype=EDGE)
+        self.link_all(self.match_edges(tree))
+        if len(tree) == forest_size:
+            return
+
+        # Un árbol que no cubre todas las componentes (por ejemplo, calculado desde un solo
+        # nodo) se completa con Kruskal para que sea un bosque de expansión mínima del grafo
+        n = self.num_edges
+        components = DisjointSet(self.num_nodes)
+        for source, target in zip(tree["source"].tolist(), tree["target"].tolist()):
+            components.union(source, target)
+        size = len(tree)
+        for e in np.lexsort((np.arange(n), self.weights[:n])).tolist():
+            if components.union(int(self.sources[e]), int(self.targets[e])):
+                self.link(e)
+                size += 1
+                if size == forest_size:
+                    break
+
+    # Id de la arista del grafo que corresponde a cada arista del árbol, sin importar el
+    # sentido; con aristas paralelas iguales cada una del árbol toma una distinta. Los
+    # extremos y el peso se reducen a una sola clave entera (rango del par de extremos y
+    # rango del peso) y ambas listas se ordenan por ella
+    def match_edges(self, tree):
+        n = self.num_edges
+        sources = np.concatenate((self.sources[:n], tree["source"]))
+        targets = np.concatenate((self.targets[:n], tree["target"]))
+        pairs = np.minimum(sources, targets) * self.num_nodes + np.maximum(sources, targets)
+        pair_ranks = np.unique(pairs, return_inverse=True)[1].ravel()
+        weights, weight_ranks = np.unique(np.concatenate((self.weights[:n], tree["weight"])),
+                                          return_inverse=True)
+        keys = pair_ranks * len(weights) + weight_ranks.ravel()
+        edge_keys, tree_keys = keys[:n], keys[n:]
+
+        edge_order = np.argsort(edge_keys, kind="stable")
+        sorted_edges = edge_keys[edge_order]
+        tree_order = np.argsort(tree_keys, kind="stable")
+        sorted_tree = tree_keys[tree_order]
+
+        # La i-ésima arista del árbol con una clave toma la i-ésima del grafo con esa clave
+        repeat = np.arange(len(tree)) - np.searchsorted(sorted_tree, sorted_tree)
+        found = np.searchsorted(sorted_edges, sorted_tree) + repeat
+        valid = found < n
+        valid[valid] = sorted_edges[found[valid]] == sorted_tree[valid]
+        if not valid.all():
+            source, target, weight = tree[tree_order[np.argmin(valid)]].tolist()
+            raise KeyError("La arista (%r, %r, %r) del árbol no está en el grafo"
+                           % (source, target, weight))
+
+        matched = np.empty(len(tree), dtype=np.int64)
+        matched[tree_order] = edge_order[found]
+        return matched
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    # Índice de un nodo; los ids que no existen se agregan como nodos nuevos
+    def node(self, node_id):
+        index = self.index.get(node_id)
+        if index is None:
+            index = self.index[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+        return index
+
+    def add_edge(self, source, target, weight):
+        if self.num_edges == len(self.weights):
+            capacity = 2 * len(self.weights)
+            for name in ("sources", "targets", "weights", "alive"):
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:len(array)] = array
+                setattr(self, name, grown)
+
+        e = self.num_edges
+        self.sources[e] = source
+        self.targets[e] = target
+        self.weights[e] = weight
+        self.alive[e] = True
+        self.num_edges += 1
+        return e
+
+    # Arista viva entre dos nodos; con aristas paralelas se prefiere la del árbol
+    def find_edge(self, source_id, target_id):
+        source = self.index.get(source_id)
+        target = self.index.get(target_id)
+        if source is not None and target is not None:
+            n = self.num_edges
+            sources, targets = self.sources[:n], self.targets[:n]
+            found = np.flatnonzero(self.alive[:n] & (((sources == source) & (targets == target)) |
+                                                     ((sources == target) & (targets == source))))
+            if len(found):
+                if self.tree is not None:
+                    for e in found.tolist():
+                        if e in self.tree:
+                            return e
+                return int(found[np.argmin(self.weights[found])])
+        raise KeyError("No existe la arista (%r, %r)" % (source_id, target_id))
+
+    def link(self, e):
+        source, target = int(self.sources[e]), int(self.targets[e])
+        self.tree[e] = None
+        self.tree_adjacency.setdefault(source, {})[target] = e
+        self.tree_adjacency.setdefault(target, {})[source] = e
+
+    # link para muchas aristas a la vez, sin convertir cada extremo por separado
+    def link_all(self, edges):
+        adjacency = self.tree_adjacency
+        self.tree.update(dict.fromkeys(edges.tolist()))
+        for e, source, target in zip(edges.tolist(), self.sources[edges].tolist(),
+                                     self.targets[edges].tolist()):
+            adjacency.setdefault(source, {})[target] = e
+            adjacency.setdefault(target, {})[source] = e
+
+    def unlink(self, e):
+        source, target = int(self.sources[e]), int(self.targets[e])
+        del self.tree[e]
+        del self.tree_adjacency[source][target]
+        del self.tree_adjacency[target][source]
+
+    # Aristas del camino del árbol entre source y target (BFS), None si no están conectados
+    def tree_path(self, source, target):
+        parent = {source: None}
+        queue = deque([source])
+        while queue and target not in parent:
+            node = queue.popleft()
+            for neighbor, e in self.tree_adjacency.get(node, {}).items():
+                if neighbor not in parent:
+                    parent[neighbor] = (node, e)
+                    queue.append(neighbor)
+
+        if target not in parent:
+            return None
+
+        path = []
+        node = target
+        while parent[node] is not None:
+            node, e = parent[node]
+            path.append(e)
+        return path
+
+    # Nodos del árbol alcanzables desde node, como máscara booleana
+    def component(self, node):
+        side = np.zeros(self.num_nodes, dtype=bool)
+        side[node] = True
+        queue = deque([node])
+        while queue:
+            for neighbor in self.tree_adjacency.get(queue.popleft(), {}):
+                if not side[neighbor]:
+                    side[neighbor] = True
+                    queue.append(neighbor)
+        return side
+
+    # Regla del ciclo: e (fuera del árbol) entra si es más barata que la arista más pesada
+    # del camino del árbol entre sus extremos. Devuelve (agregadas, quitadas)
+    def cycle_swap(self, e):
+        source, target = int(self.sources[e]), int(self.targets[e])
+        if source == target:
+            return [], []
+
+        path = self.tree_path(source, target)
+        if path is None:
+            self.link(e)
+            return [e], []
+
+        heaviest = max(path, key=lambda f: self.weights[f])
+        if self.weights[e] < self.weights[heaviest]:
+            self.unlink(heaviest)
+            self.link(e)
+            return [e], [heaviest]
+        return [], []
+
+    # Regla del corte: e ya salió del árbol; entra la arista viva más barata (a igual peso,
+    # la de menor id) entre los dos lados. Devuelve la arista que entró o None
+    def cut_replacement(self, e):
+        side = self.component(int(self.sources[e]))
+        n = self.num_edges
+        crossing = np.flatnonzero(self.alive[:n] &
+                                  (side[self.sources[:n]] != side[self.targets[:n]]))
+        if len(crossing) == 0:
+            return None
+
+        best = int(crossing[np.argmin(self.weights[crossing])])
+        self.link(best)
+        return best
+
+    def insert_edge(self, source_id, target_id, weight):
+        e = self.add_edge(self.node(source_id), self.node(target_id), weight)
+        if self.tree is None:
+            return [], []
+        return self.cycle_swap(e)
+
+    def delete_edge(self, source_id, target_id):
+        e = self.find_edge(source_id, target_id)
+        self.alive[e] = False
+        if self.tree is None or e not in self.tree:
+            return [], []
+
+        self.unlink(e)
+        replacement = self.cut_replacement(e)
+        return ([] if replacement is None else [replacement]), [e]
+
+    def set_weight(self, source_id, target_id, weight):
+        e = self.find_edge(source_id, target_id)
+        old_weight = self.weights[e]
+        self.weights[e] = weight
+        if self.tree is None:
+            return [], []
+
+        if e in self.tree:
+            # Más barata: sigue siendo la mejor del corte. Más cara: puede haber otra mejor,
+            # se busca entre todas las que cruzan el corte (incluida ella misma)
+            self.unlink(e)
+            if weight <= old_weight:
+                self.link(e)
+                return [e], [e]
+            replacement = self.cut_replacement(e)
+            if replacement == e:
+                return [e], [e]
+            return [replacement], [e]
+
+        if weight < old_weight:
+            return self.cycle_swap(e)
+        return [], []
+
+    # Aristas del árbol como arreglo EDGE con índices de nodo, igual que mst.py
+    def tree_edges(self):
+        return self.edges(np.fromiter(self.tree, dtype=np.int64, count=len(self.tree)))
+
+    # Arreglo EDGE con las aristas de ids edges (vivas o no)
+    def edges(self, edges):
+        edges = np.asarray(edges, dtype=np.int64)
+        tree = np.empty(len(edges), dtype=EDGE)
+        tree["source"] = self.sources[edges]
+        tree["target"] = self.targets[edges]
+        tree["weight"] = self.weights[edges]
+        return tree
+
+    # CSRGraph con las aristas vivas; los nodos conservan sus índices
+    def to_graph(self):
+        alive = np.flatnonzero(self.alive[:self.num_edges])
+        return CSRGraph(self.node_ids, self.sources[alive], self.targets[alive],
+                        self.weights[alive], index=dict(self.index))
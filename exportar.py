@@ -0,0 +1,220 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+import zlib
+from multiprocessing import Pool
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+from cache_grafo import load_graph_cached
+from cache_mst import cached_mst
+from layout import node_layout, file_key
+from render import MSTRenderer
+import mst
+
+# Exporta la animación del árbol de expansión mínima a GIF o MP4 sin interfaz gráfica: cada
+# cuadro se dibuja con Agg fuera de pantalla y los cuadros se reparten entre varios procesos.
+#
+#   python exportar.py prueba4.json -o arbol.gif --fps 10
+#   python exportar.py grande.csv -o arbol.mp4 -a kruskal -j 8      (MP4 necesita ffmpeg)
+
+FORMATS = (".gif", ".mp4")
+
+# Mismos colores que la ventana de main.py
+STYLE = dict(node_color="gray", node_size=400, edge_color="black", tree_color="blue",
+             source_color="red", target_color="blue")
+
+# Cuadros por tarea: dentro de una tarea cada cuadro solo pinta la arista nueva sobre el
+# anterior y solo el primero se dibuja completo. El tamaño no depende de la cantidad de
+# procesos, así el archivo sale igual con cualquier -j
+CHUNK_SIZE = 64
+
+
+# Estado de cada proceso: un renderer propio sobre una figura Agg, creado una sola vez
+worker = None
+
+
+class FrameRenderer:
+    def __init__(self, graph, positions, tree_edges, size, dpi, palette=None):
+        width, height = size
+        self.figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.renderer = MSTRenderer(self.figure, self.canvas, graph, positions, **STYLE)
+        self.renderer.set_tree(tree_edges)
+
+        # Paleta fija de 256 colores para los GIF, la misma en todos los procesos
+        self.palette = None
+        if palette is not None:
+            self.palette = Image.new("P", (1, 1))
+            self.palette.putpalette(palette)
+
+    # Imagen RGB del paso step. Con full se dibuja completa; si no, y step sigue al último
+    # dibujado, solo se pinta la arista nueva sobre la imagen actual (como el blitting de las
+    # ventanas)
+    def frame(self, step, full=False):
+        if full:
+            self.renderer.seek(step)
+            self.renderer.shown = step
+            self.renderer.draw()
+        else:
+            self.renderer.show(step)
+        return np.asarray(self.canvas.buffer_rgba())[:, :, :3].copy()
+
+    # Cuadro comprimido para enviarlo al proceso principal: con paleta para GIF o RGB para MP4
+    def encode(self, step, full=False):
+        rgb = self.frame(step, full)
+        if self.palette is None:
+            return zlib.compress(rgb.tobytes(), 1)
+        image = Image.fromarray(rgb).quantize(palette=self.palette, dither=Image.Dither.NONE)
+        return zlib.compress(image.tobytes(), 1)
+
+
+def init_worker(file_path, weight, positions, tree_edges, size, dpi, palette):
+    global worker
+    graph = load_graph_cached(file_path, weight=weight)
+    worker = FrameRenderer(graph, positions, tree_edges, size, dpi, palette)
+
+
+# Trabajo de cada proceso: los cuadros de los pasos start..stop - 1. El primero se dibuja
+# completo para que el resultado no dependa de qué tareas le tocaron antes a este proceso
+def render_chunk(chunk):
+    start, stop = chunk
+    return [worker.encode(step, full=step == start) for step in range(start, stop)]
+
+
+# Paleta común para todos los cuadros: se arma con el primer y el último paso, que juntos
+# tienen todos los colores de la animación
+def gif_palette(renderer, last_step):
+    first = renderer.frame(-1, full=True)
+    last = renderer.frame(last_step, full=True)
+    both = Image.fromarray(np.concatenate((first, last)))
+    return both.quantize(colors=256, method=Image.Quantize.MEDIANCUT).getpalette()
+
+
+class GifWriter:
+    def __init__(self, file_path, size, fps, palette):
+        self.file_path = file_path
+        self.size = size
+        self.duration = int(round(1000 / fps))
+        self.palette = palette
+
+    def write_all(self, frames):
+        images = (self.image(data) for data in frames)
+        first = next(images)
+        first.save(self.file_path, save_all=True, append_images=images,
+                   duration=self.duration, loop=0, optimize=False)
+
+    def image(self, data):
+        image = Image.frombytes("P", self.size, zlib.decompress(data))
+        image.putpalette(self.palette)
+        return image
+
+
+# MP4 con ffmpeg: los cuadros RGB se envían crudos por la entrada estándar
+class Mp4Writer:
+    def __init__(self, file_path, size, fps):
+        self.file_path = file_path
+        self.size = size
+        self.fps = fps
+
+    def write_all(self, frames):
+        width, height = self.size
+        command = ["ffmpeg", "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", "%dx%d" % (width, height),
+                   "-r", str(self.fps), "-i", "-",
+                   # yuv420p necesita ancho y alto pares
+                   "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p",
+                   "-vcodec", "libx264", self.file_path]
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError("Se necesita ffmpeg para exportar MP4; use .gif o instale ffmpeg")
+
+        try:
+            for data in frames:
+                process.stdin.write(zlib.decompress(data))
+        finally:
+            process.stdin.close()
+            if process.wait() != 0:
+                raise RuntimeError("ffmpeg terminó con código %d" % process.returncode)
+
+
+# Pasos -1 (grafo sin árbol) a num_steps - 1 en tareas de CHUNK_SIZE cuadros
+def chunks(num_steps, size=CHUNK_SIZE):
+    return [(start, min(start + size, num_steps)) for start in range(-1, num_steps, size)]
+
+
+def export(file_path, output, algorithm="prim", weight="weight", fps=10, size=(800, 600),
+           dpi=100, workers=None):
+    extension = os.path.splitext(output)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError("Formato no soportado: %r (use %s)" % (extension, " o ".join(FORMATS)))
+    workers = max(1, workers or os.cpu_count())
+
+    # Grafo, posiciones y árbol se calculan una vez aquí (con los mismos cachés que las
+    # ventanas); cada proceso vuelve a abrir el grafo desde el caché en disco
+    graph = load_graph_cached(file_path, weight=weight)
+    positions = node_layout(graph, file_key(file_path))
+    tree, _ = cached_mst(graph, mst.ALGORITHMS[algorithm])
+    tree_edges = graph.label_edges(tree)
+
+    palette = None
+    if extension == ".gif":
+        renderer = FrameRenderer(graph, positions, tree_edges, size, dpi)
+        palette = gif_palette(renderer, len(tree_edges) - 1)
+        writer = GifWriter(output, size, fps, palette)
+    else:
+        writer = Mp4Writer(output, size, fps)
+
+    tasks = chunks(len(tree_edges))
+    with Pool(workers, initializer=init_worker,
+              initargs=(file_path, weight, positions, tree_edges, size, dpi, palette)) as pool:
+        # imap conserva el orden de las tareas, así los cuadros llegan en orden al archivo
+        frames = (data for chunk in pool.imap(render_chunk, tasks) for data in chunk)
+        writer.write_all(frames)
+
+    return len(tree_edges) + 1
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Exporta la animación del árbol de expansión mínima a GIF o MP4.")
+    parser.add_argument("path", help="grafo (JSON o lista de aristas)")
+    parser.add_argument("-o", "--output", required=True, help="archivo .gif o .mp4")
+    parser.add_argument("-a", "--algorithm", choices=sorted(mst.ALGORITHMS), default="prim")
+    parser.add_argument("-w", "--weight", default="weight",
+                        help="campo de peso preferido (weight, distance o peso)")
+    parser.add_argument("--fps", type=float, default=10, help="cuadros por segundo")
+    parser.add_argument("--size", type=parse_size, default=(800, 600),
+                        help="tamaño de los cuadros en píxeles, por ejemplo 800x600")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="cantidad de procesos")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    try:
+        frames = export(args.path, args.output, args.algorithm, args.weight, args.fps,
+                        args.size, args.dpi, args.workers)
+    except (OSError, ValueError, KeyError, RuntimeError) as error:
+        print("%s: %s" % (type(error).__name__, error), file=sys.stderr)
+        return 1
+
+    print("%s: %d cuadros en %.1f s" % (args.output, frames, time.perf_counter() - start),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
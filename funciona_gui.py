@@ -0,0 +1,37 @@
+from PyQt5.QtWidgets import QVBoxLayout, QWidget, QPushButton
+from ventana import MSTWindow
+import mst
+
+
+class GraphWindow(MSTWindow):
+    def __init__(self):
+        super().__init__()
+
+        self.setWindowTitle("Graph Viewer")
+        self.setGeometry(100, 100, 800, 400)
+
+        layout = QVBoxLayout()
+
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.make_slider())
+
+        import_button = QPushButton("Import JSON")
+        import_button.clicked.connect(self.import_json)
+        layout.addWidget(import_button)
+
+        self.find_button = QPushButton("Find Minimum Spanning Tree")
+        self.find_button.clicked.connect(self.find_mst)
+        layout.addWidget(self.find_button)
+
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset_animation)
+        layout.addWidget(self.reset_button)
+
+        layout.addWidget(self.tasks)
+
+        self.central_widget = QWidget()
+        self.central_widget.setLayout(layout)
+        self.setCentralWidget(self.central_widget)
+
+    def find_mst(self):
+        self.start_mst(mst.prim_mst)
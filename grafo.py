@@ -0,0 +1,212 @@
+import math
+from array import array
+import numpy as np
+
+# Arista de un árbol como registro de 16 bytes (extremos int32 y peso float64). Los árboles
+# de mst.py son arreglos estructurados con este tipo en lugar de listas de tuplas, que
+# ocupan unas diez veces más (una tupla y tres objetos de Python por arista)
+EDGE = np.dtype([("source", np.int32), ("target", np.int32), ("weight", np.float64)])
+
+
+# Grafo no dirigido compacto en formato CSR (arreglos de NumPy en lugar de dicts de networkx)
+class CSRGraph:
+    def __init__(self, node_ids, sources, targets, weights, index=None, adjacency=None):
+        # Los nodos se numeran 0..n-1; node_ids traduce el índice al id original del JSON
+        self.node_ids = list(node_ids)
+        if index is None:
+            index = {node: i for i, node in enumerate(self.node_ids)}
+        self.index = index
+
+        # Lista de aristas: extremos y peso de cada arista
+        self.sources = np.asarray(sources, dtype=np.int32)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+        # La adyacencia puede venir ya calculada (por ejemplo, desde el caché en disco)
+        if adjacency is None:
+            adjacency = self.build_adjacency()
+        self.offsets, self.neighbors, self.edge_index = adjacency
+
+        # Identidad del contenido para el caché de árboles (ver cache_mst.graph_key): el
+        # nombre de la entrada del caché de grafos si se cargó de un archivo, o el hash del
+        # contenido, que se calcula una sola vez. Un CSRGraph no cambia después de armarse
+        self.source_key = None
+        self.content_hash = None
+
+    def build_adjacency(self):
+        num_nodes = len(self.node_ids)
+        num_edges = len(self.weights)
+
+        # Cada arista aparece dos veces en la adyacencia, una por extremo
+        endpoints = np.concatenate((self.sources, self.targets))
+        others = np.concatenate((self.targets, self.sources))
+        edge_index = np.tile(np.arange(num_edges, dtype=np.int32), 2)
+
+        # Orden estable por extremo: la clave (extremo, posición) no tiene empates y el
+        # quicksort de NumPy sobre ella es bastante más rápido que argsort(kind="stable")
+        order = np.argsort(endpoints.astype(np.int64) << 32 | np.arange(2 * num_edges))
+
+        # offsets[i]:offsets[i + 1] delimita los vecinos del nodo i
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(endpoints, minlength=num_nodes), out=offsets[1:])
+
+        # edge_index: arista (posición en sources/targets/weights) que lleva a cada vecino
+        return offsets, others[order], edge_index[order]
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.weights)
+
+    @property
+    def nbytes(self):
+        return (self.sources.nbytes + self.targets.nbytes + self.weights.nbytes
+                + self.offsets.nbytes + self.neighbors.nbytes + self.edge_index.nbytes)
+
+    def adjacency(self, node):
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return self.neighbors[start:end], self.weights[self.edge_index[start:end]]
+
+    # Subgrafo inducido por nodes (índices en orden creciente): sus nodos se numeran
+    # 0..len(nodes)-1 en ese orden y las aristas conservan su orden relativo
+    def subgraph(self, nodes):
+        local = np.full(self.num_nodes, -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+        sources = local[self.sources]
+        targets = local[self.targets]
+        keep = (sources >= 0) & (targets >= 0)
+        node_ids = self.node_ids
+        return CSRGraph([node_ids[i] for i in nodes.tolist()], sources[keep], targets[keep],
+                        self.weights[keep])
+
+    # Traduce aristas (origen, destino, peso) con índices enteros a los ids del JSON; recibe
+    # un arreglo EDGE o una lista de tuplas. Con weight se devuelve el formato de networkx
+    # (u, v, {weight: peso})
+    def label_edges(self, tree_edges, weight=None):
+        node_ids = self.node_ids
+        tree = np.asarray(tree_edges, dtype=EDGE)
+        pairs = zip(tree["source"].tolist(), tree["target"].tolist())
+        if weight is None:
+            return [(node_ids[u], node_ids[v]) for u, v in pairs]
+        return [(node_ids[u], node_ids[v], {weight: w})
+                for (u, v), w in zip(pairs, tree["weight"].tolist())]
+
+    # Conversión a networkx, solo para la capa de dibujo
+    def to_networkx(self, weight="weight"):
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self.node_ids)
+        node_ids = self.node_ids
+        graph.add_weighted_edges_from(
+            ((node_ids[u], node_ids[v], w) for u, v, w in zip(
+                self.sources.tolist(), self.targets.tolist(), self.weights.tolist())),
+            weight=weight)
+        return graph
+
+
+# Esquemas de entrada reconocidos:
+#   {"nodes": [{"id"}], "edges": [{"source", "target", "weight" o "distance"}]}
+#   {"grafo": {"nodos": [{"id"}], "aristas": [{"inicio", "fin", "peso"}]}}
+NODE_SECTIONS = ("nodes", "nodos")
+EDGE_SECTIONS = ("edges", "aristas")
+ENDPOINT_KEYS = (("source", "target"), ("inicio", "fin"))
+WEIGHT_KEYS = ("weight", "distance", "peso")
+
+
+# Acumula nodos y aristas por lotes en arreglos compactos (array) y arma el CSRGraph al final
+class GraphBuilder:
+    def __init__(self, weight="weight", default_weight=None):
+        # Campo de peso preferido; si la primera arista no lo tiene se usa el de WEIGHT_KEYS
+        # que sí tenga, así cualquier ventana abre cualquiera de los esquemas
+        self.weight = weight
+        # Peso para aristas sin el campo de peso; None lo vuelve obligatorio. Los pesos del
+        # archivo deben ser números finitos, pero el de por omisión lo elige quien llama
+        # (main2 usa NaN para las aristas sin etiqueta)
+        self.default_weight = default_weight
+        # Claves de las aristas, se detectan con la primera arista
+        self.edge_keys = None
+        self.node_ids = []
+        self.index = {}
+        self.sources = array("i")
+        self.targets = array("i")
+        self.weights = array("d")
+
+    def node_index(self, node):
+        # Las aristas pueden mencionar nodos que no están en la lista de nodos
+        index = self.index.get(node)
+        if index is None:
+            index = self.index[node] = len(self.node_ids)
+            self.node_ids.append(node)
+        return index
+
+    def add_nodes(self, nodes):
+        for node in nodes:
+            self.node_index(node["id"])
+
+    def detect_schema(self, edge):
+        source, target = next((keys for keys in ENDPOINT_KEYS if keys[0] in edge), ENDPOINT_KEYS[0])
+        weight = self.weight
+        if weight not in edge:
+            weight = next((key for key in WEIGHT_KEYS if key in edge), weight)
+        self.edge_keys = source, target, weight
+
+    def add_edges(self, edges):
+        if not edges:
+            return
+        if self.edge_keys is None:
+            self.detect_schema(edges[0])
+
+        node_index = self.node_index
+        source, target, weight = self.edge_keys
+        self.sources.extend(node_index(edge[source]) for edge in edges)
+        self.targets.extend(node_index(edge[target]) for edge in edges)
+        # float() acepta también pesos escritos como texto ("2.5")
+        if self.default_weight is None:
+            weights = [float(edge[weight]) for edge in edges]
+        else:
+            default_weight = self.default_weight
+            weights = [float(edge.get(weight, default_weight)) for edge in edges]
+        if not all(map(math.isfinite, weights)):
+            self.check_weights(edges, weights)
+        self.weights.extend(weights)
+
+    # NaN o infinito en el archivo: los algoritmos no coinciden con esos pesos (Prim nunca
+    # elige una arista NaN), así que es un error con el número de la arista
+    def check_weights(self, edges, weights):
+        weight = self.edge_keys[2]
+        for number, (edge, value) in enumerate(zip(edges, weights), len(self.weights) + 1):
+            if not math.isfinite(value) and (self.default_weight is None or weight in edge):
+                raise ValueError("Arista %d: el peso %r no es un número finito"
+                                 % (number, edge[weight]))
+
+    def build(self):
+        return CSRGraph(self.node_ids,
+                        np.frombuffer(self.sources, dtype=np.int32),
+                        np.frombuffer(self.targets, dtype=np.int32),
+                        np.frombuffer(self.weights, dtype=np.float64),
+                        index=self.index)
+
+
+# Lista de una sección del JSON con cualquiera de sus nombres
+def section(json_data, names):
+    for name in names:
+        if name in json_data:
+            return json_data[name]
+    raise KeyError(names[0])
+
+
+# Construye el grafo compacto directamente desde las listas de nodos y aristas del JSON,
+# en cualquiera de los esquemas reconocidos
+def graph_from_json(json_data, weight="weight"):
+    json_data = json_data.get("grafo", json_data)
+    builder = GraphBuilder(weight)
+    builder.add_nodes(section(json_data, NODE_SECTIONS))
+    builder.add_edges(section(json_data, EDGE_SECTIONS))
+    return builder.build()
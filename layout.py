@@ -0,0 +1,494 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from cache_grafo import CACHE_ROOT
+
+# Semilla fija: el mismo grafo siempre se dibuja igual
+LAYOUT_SEED = 42
+
+# Iteraciones de fuerza por nivel de la jerarquía y tiempo máximo (segundos, None = sin límite)
+LAYOUT_ITERATIONS = 50
+LAYOUT_TIME_BUDGET = None
+
+# Criterio de Barnes–Hut: una celda de lado s a distancia d se aproxima si s / d < theta
+BH_THETA = 1.2
+
+# Profundidad máxima del quadtree (rejilla de 2^16 x 2^16 celdas)
+MAX_DEPTH = 16
+
+# Iteraciones mínimas del reacomodo incremental; se suma una por cada nodo que se mueve
+INCREMENTAL_ITERATIONS = 10
+
+# La jerarquía deja de engrosarse con menos nodos que esto o si un nivel casi no reduce
+COARSEST_SIZE = 50
+MIN_REDUCTION = 0.8
+
+
+# Intercala los bits de las coordenadas enteras (código de Morton / orden Z)
+def morton_codes(ix, iy):
+    def spread(v):
+        v = v & 0xFFFF
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        v = (v | (v << 1)) & 0x55555555
+        return v
+
+    return spread(ix) | (spread(iy) << 1)
+
+
+# Quadtree de Barnes–Hut de las posiciones pos, armado ordenando los nodos por código de
+# Morton: cada celda de cada nivel es un tramo contiguo del arreglo ordenado, y sus hijas son
+# los tramos del nivel siguiente que caen dentro de él. Por nivel guarda el inicio de cada
+# celda, su cantidad de nodos, su centro de masa y su primera hija y cantidad de hijas; order
+# es el orden de Morton de los nodos
+def quadtree(pos):
+    n = len(pos)
+
+    low = pos.min(axis=0)
+    span = max(float((pos.max(axis=0) - low).max()), 1e-12)
+    grid = ((pos - low) * ((2 ** MAX_DEPTH - 1) / span)).astype(np.int64)
+    codes = morton_codes(grid[:, 0], grid[:, 1])
+
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    xs = pos[order, 0]
+    ys = pos[order, 1]
+
+    levels = []
+    for level in range(MAX_DEPTH + 1):
+        keys = codes >> (2 * (MAX_DEPTH - level))
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        counts = np.diff(np.append(starts, n))
+        center_x = np.add.reduceat(xs, starts) / counts
+        center_y = np.add.reduceat(ys, starts) / counts
+        levels.append([starts, counts, center_x, center_y])
+
+        # Todas las celdas tienen un solo nodo: no hace falta bajar más
+        if len(starts) == n:
+            break
+
+    for level in range(len(levels) - 1):
+        starts, counts = levels[level][:2]
+        child_starts = levels[level + 1][0]
+        first = np.searchsorted(child_starts, starts)
+        levels[level] += [first, np.searchsorted(child_starts, starts + counts) - first]
+    return levels, span, order
+
+
+# Fuerzas de repulsión que el quadtree tree ejerce sobre los puntos points, O(P log V).
+# El recorrido avanza nivel por nivel con pares (punto, celda); un punto no se repele a sí
+# mismo porque su propia hoja está a distancia 0
+def tree_repulsion(tree, points, k, theta=BH_THETA):
+    levels, span, _ = tree
+    last_level = len(levels) - 1
+    n = len(points)
+    xs = points[:, 0]
+    ys = points[:, 1]
+
+    force_x = np.zeros(n)
+    force_y = np.zeros(n)
+    nodes = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    for level in range(last_level + 1):
+        starts, counts, center_x, center_y = levels[level][:4]
+        delta_x = xs[nodes] - center_x[cells]
+        delta_y = ys[nodes] - center_y[cells]
+        dist2 = delta_x * delta_x + delta_y * delta_y
+        size = span / 2 ** level
+        mass = counts[cells]
+
+        # Celdas lejanas u hojas se tratan como una sola masa en su centro
+        if level == last_level:
+            done = np.ones(len(nodes), dtype=bool)
+        else:
+            done = (size * size < theta * theta * dist2) | (mass == 1)
+        use = done & (dist2 > 0)
+
+        # Magnitud k^2 / d en la dirección delta / d, multiplicada por la masa de la celda
+        scale = mass[use] * (k * k) / dist2[use]
+        force_x += np.bincount(nodes[use], weights=delta_x[use] * scale, minlength=n)
+        force_y += np.bincount(nodes[use], weights=delta_y[use] * scale, minlength=n)
+
+        # Las celdas cercanas se abren: el par pasa a cada una de sus hijas
+        expand = ~done
+        if not expand.any():
+            break
+        nodes = nodes[expand]
+        cells = cells[expand]
+
+        first, num_children = levels[level][4:]
+        num = num_children[cells]
+        nodes = np.repeat(nodes, num)
+        offsets = np.repeat(np.cumsum(num) - num, num)
+        cells = np.repeat(first[cells], num) + (np.arange(len(nodes)) - offsets)
+
+    return np.stack((force_x, force_y), axis=1)
+
+
+# Fuerzas de repulsión aproximadas con Barnes–Hut entre todos los nodos, O(V log V). Los
+# nodos se recorren en orden de Morton, así los vecinos en el arreglo también lo son en el
+# quadtree
+def repulsion(pos, k, theta=BH_THETA):
+    tree = quadtree(pos)
+    order = tree[2]
+    force = np.empty_like(pos)
+    force[order] = tree_repulsion(tree, pos[order], k, theta)
+    return force
+
+
+# Fuerzas de atracción de Fruchterman–Reingold a lo largo de las aristas (d^2 / k)
+def attraction(pos, sources, targets, k):
+    delta = pos[sources] - pos[targets]
+    pull = delta * (np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+
+    n = len(pos)
+    force = np.zeros((n, 2))
+    for axis in (0, 1):
+        force[:, axis] -= np.bincount(sources, weights=pull[:, axis], minlength=n)
+        force[:, axis] += np.bincount(targets, weights=pull[:, axis], minlength=n)
+    return force
+
+
+# Limita el desplazamiento de cada nodo a la temperatura actual
+def limited(displacement, temperature):
+    length = np.sqrt((displacement * displacement).sum(axis=1))
+    length[length == 0] = 1
+    return displacement * (np.minimum(length, temperature) / length)[:, None]
+
+
+# Iteraciones de fuerza con temperatura que baja linealmente. tick, si se pasa, se llama
+# una vez por iteración
+def relax(pos, sources, targets, k, temperature, iterations, deadline, theta=BH_THETA,
+          tick=None):
+    step = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if tick is not None:
+            tick()
+
+        displacement = repulsion(pos, k, theta) + \
+            attraction(pos, sources, targets, k)
+        pos += limited(displacement, temperature)
+
+        temperature -= step
+    return pos
+
+
+# Como relax, pero solo se mueven los nodos con movable=True y solo para ellos se calculan
+# fuerzas: los nodos fijos forman un quadtree que se arma una sola vez, los móviles uno
+# propio en cada iteración, y la atracción usa solo las aristas que tocan un nodo móvil.
+# Así acomodar unos pocos nodos nuevos cuesta O(M log V) por iteración y no O(V log V)
+def relax_movable(pos, movable, sources, targets, k, temperature, iterations, deadline,
+                  theta=BH_THETA, tick=None):
+    nodes = np.flatnonzero(movable)
+    fixed_tree = quadtree(pos[~movable]) if not movable.all() else None
+
+    # Índice de cada nodo móvil entre los móviles; las aristas entre dos nodos fijos no
+    # mueven a nadie
+    row = np.full(len(pos), -1)
+    row[nodes] = np.arange(len(nodes))
+    incident = movable[sources] | movable[targets]
+    sources, targets = sources[incident], targets[incident]
+    source_rows, target_rows = row[sources], row[targets]
+    pulled, pushed = source_rows >= 0, target_rows >= 0
+
+    step = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        if tick is not None:
+            tick()
+
+        moving = pos[nodes]
+        tree = quadtree(moving)
+        order = tree[2]
+        forces = tree_repulsion(tree, moving[order], k, theta)
+        if fixed_tree is not None:
+            forces += tree_repulsion(fixed_tree, moving[order], k, theta)
+        displacement = np.empty_like(moving)
+        displacement[order] = forces
+
+        delta = pos[sources] - pos[targets]
+        pull = delta * (np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+        for axis in (0, 1):
+            displacement[:, axis] -= np.bincount(source_rows[pulled], weights=pull[pulled, axis],
+                                                 minlength=len(nodes))
+            displacement[:, axis] += np.bincount(target_rows[pushed], weights=pull[pushed, axis],
+                                                 minlength=len(nodes))
+
+        pos[nodes] = moving + limited(displacement, temperature)
+
+        temperature -= step
+    return pos
+
+
+# Un nivel de engrosamiento: emparejamiento localmente dominante con prioridades aleatorias.
+# Cada nodo elige su arista de mayor prioridad y las aristas elegidas por ambos extremos se
+# contraen; se repite unas rondas entre los nodos que quedaron libres. Al final las hojas
+# libres se pegan a su único vecino, así las estrellas también se reducen.
+# Devuelve el nodo grueso de cada nodo y las aristas del grafo grueso
+def coarsen(num_nodes, sources, targets, rng, rounds=3):
+    parent = np.arange(num_nodes)
+    free = np.ones(num_nodes, dtype=bool)
+
+    for _ in range(rounds):
+        candidates = free[sources] & free[targets]
+        if not candidates.any():
+            break
+        round_sources = sources[candidates]
+        round_targets = targets[candidates]
+
+        priority = rng.random(len(round_sources))
+        best = np.full(num_nodes, -1.0)
+        np.maximum.at(best, round_sources, priority)
+        np.maximum.at(best, round_targets, priority)
+        matched = (best[round_sources] == priority) & (best[round_targets] == priority)
+
+        parent[round_targets[matched]] = round_sources[matched]
+        free[round_sources[matched]] = False
+        free[round_targets[matched]] = False
+
+    degree = np.bincount(sources, minlength=num_nodes) + \
+        np.bincount(targets, minlength=num_nodes)
+    for leaf_side, other_side in ((sources, targets), (targets, sources)):
+        leaves = free[leaf_side] & (degree[leaf_side] == 1) & (degree[other_side] > 1)
+        parent[leaf_side[leaves]] = parent[other_side[leaves]]
+
+    is_root = parent == np.arange(num_nodes)
+    mapping = (np.cumsum(is_root) - 1)[parent]
+    num_coarse = int(is_root.sum())
+
+    # Aristas del grafo grueso sin lazos ni repetidas
+    coarse_sources = mapping[sources]
+    coarse_targets = mapping[targets]
+    keep = coarse_sources != coarse_targets
+    low = np.minimum(coarse_sources[keep], coarse_targets[keep])
+    high = np.maximum(coarse_sources[keep], coarse_targets[keep])
+    keys = np.unique(low * num_coarse + high)
+
+    return mapping, num_coarse, keys // num_coarse, keys % num_coarse
+
+
+# Centra las posiciones en el origen y las escala a [-1, 1], como nx.spring_layout
+def rescale(pos):
+    pos -= pos.mean(axis=0)
+    limit = np.abs(pos).max()
+    if limit > 0:
+        pos /= limit
+    return pos
+
+
+# Layout de fuerzas escalable: jerarquía multinivel + repulsión Barnes–Hut vectorizada.
+# Con pos/fixed (reacomodo incremental) no se engrosa: los nodos nuevos empiezan junto a
+# sus vecinos ya ubicados y solo ellos se mueven.
+# progress, si se pasa, recibe (iteraciones hechas, iteraciones totales) y puede lanzar una
+# excepción para cancelar
+def force_layout(graph, pos=None, fixed=None, iterations=LAYOUT_ITERATIONS,
+                 time_budget=LAYOUT_TIME_BUDGET, theta=BH_THETA, seed=LAYOUT_SEED,
+                 progress=None):
+    n = graph.num_nodes
+    if n == 0:
+        return {}
+
+    rng = np.random.default_rng(seed)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    sources = graph.sources.astype(np.int64)
+    targets = graph.targets.astype(np.int64)
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+
+    done = [0]
+    total = [iterations]
+
+    def tick():
+        done[0] += 1
+        if progress is not None:
+            progress(done[0], total[0])
+
+    if pos:
+        positions, movable = seed_positions(graph, pos, fixed, sources, targets, rng)
+        known = positions[~movable] if (~movable).any() else positions
+        scale = max(float((known.max(axis=0) - known.min(axis=0)).max()), 1e-3)
+        k = scale / np.sqrt(n)
+        # Pocos nodos nuevos se acomodan con pocas iteraciones: una por nodo más unas fijas
+        total[0] = min(iterations, INCREMENTAL_ITERATIONS + int(movable.sum()))
+        positions = relax_movable(positions, movable, sources, targets, k, 0.1 * scale,
+                                  total[0], deadline, theta, tick)
+        if fixed:
+            return dict(zip(graph.node_ids, map(tuple, positions.tolist())))
+        return dict(zip(graph.node_ids, map(tuple, rescale(positions).tolist())))
+
+    # Jerarquía de grafos cada vez más chicos
+    hierarchy = []
+    num_nodes = n
+    while num_nodes > COARSEST_SIZE:
+        mapping, num_coarse, coarse_sources, coarse_targets = coarsen(
+            num_nodes, sources, targets, rng)
+        if num_coarse > MIN_REDUCTION * num_nodes:
+            break
+        hierarchy.append((mapping, sources, targets))
+        num_nodes, sources, targets = num_coarse, coarse_sources, coarse_targets
+
+    # Se deshace la jerarquía: cada nodo parte de la posición de su nodo grueso y los niveles
+    # finos, que ya empiezan casi acomodados, solo necesitan unas pocas iteraciones
+    refine_iterations = max(iterations // 4, 1)
+    total[0] = iterations + refine_iterations * len(hierarchy)
+
+    # Nivel más grueso: posiciones aleatorias en el cuadrado unitario y enfriamiento completo
+    positions = rng.random((num_nodes, 2))
+    k = 1 / np.sqrt(num_nodes)
+    positions = relax(positions, sources, targets, k, 0.1,
+                      iterations, deadline, theta=theta, tick=tick)
+
+    for mapping, sources, targets in reversed(hierarchy):
+        k = 1 / np.sqrt(len(mapping))
+        positions = positions[mapping] + rng.normal(0, 0.1 * k, (len(mapping), 2))
+        positions = relax(positions, sources, targets, k, 2 * k,
+                          refine_iterations, deadline, theta=theta, tick=tick)
+
+    return dict(zip(graph.node_ids, map(tuple, rescale(positions).tolist())))
+
+
+# Posiciones iniciales para el reacomodo incremental: los nodos conocidos conservan su
+# posición y cada nodo nuevo empieza en el promedio de sus vecinos conocidos
+def seed_positions(graph, pos, fixed, sources, targets, rng):
+    n = graph.num_nodes
+    positions = np.zeros((n, 2))
+    known = np.zeros(n, dtype=bool)
+    for node, position in pos.items():
+        i = graph.index.get(node)
+        if i is not None:
+            positions[i] = position
+            known[i] = True
+
+    low = positions[known].min(axis=0) if known.any() else np.zeros(2)
+    high = positions[known].max(axis=0) if known.any() else np.ones(2)
+    spread = np.maximum(high - low, 1e-3)
+
+    total = np.zeros((n, 2))
+    count = np.zeros(n)
+    for a, b in ((sources, targets), (targets, sources)):
+        from_known = known[b] & ~known[a]
+        np.add.at(total, a[from_known], positions[b[from_known]])
+        np.add.at(count, a[from_known], 1)
+
+    new = ~known
+    with_neighbors = new & (count > 0)
+    positions[with_neighbors] = total[with_neighbors] / count[with_neighbors, None]
+    positions[new & (count == 0)] = low + rng.random(
+        (int((new & (count == 0)).sum()), 2)) * spread
+    positions[new] += rng.normal(0, 0.05, (int(new.sum()), 2)) * spread
+
+    movable = np.ones(n, dtype=bool)
+    if fixed is not None:
+        for node in fixed:
+            i = graph.index.get(node)
+            if i is not None:
+                movable[i] = False
+    return positions, movable
+
+
+# Calcula posiciones para los nodos del CSRGraph; los nodos de fixed conservan su
+# posición en pos y solo se acomodan los demás
+def compute_layout(graph, pos=None, fixed=None, iterations=LAYOUT_ITERATIONS,
+                   time_budget=LAYOUT_TIME_BUDGET, seed=LAYOUT_SEED, progress=None):
+    return force_layout(graph, pos=pos, fixed=fixed, iterations=iterations,
+                        time_budget=time_budget, seed=seed, progress=progress)
+
+
+# Identidad de un grafo cargado desde un archivo: su ruta absoluta
+def file_key(file_path):
+    return "file:" + os.path.abspath(file_path)
+
+
+# Identidad de un grafo que no viene de un archivo: hash de su lista de nodos
+def node_set_key(graph):
+    digest = hashlib.blake2b(digest_size=16)
+    for node in graph.node_ids:
+        digest.update(repr(node).encode())
+        digest.update(b"\0")
+    return "nodes:" + digest.hexdigest()
+
+
+# Guarda en disco las posiciones de los nodos de cada grafo para reutilizarlas
+class LayoutStore:
+    def __init__(self, layout_dir=None):
+        self.layout_dir = layout_dir or os.path.join(CACHE_ROOT, "layouts")
+        os.makedirs(self.layout_dir, exist_ok=True)
+
+    def path(self, key):
+        name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.layout_dir, name + ".json")
+
+    def load(self, key):
+        try:
+            with open(self.path(key), "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {node: tuple(position) for node, position in zip(data["ids"], data["pos"])}
+
+    def save(self, key, positions):
+        text = json.dumps({"ids": list(positions),
+                           "pos": [[float(x), float(y)] for x, y in positions.values()]})
+
+        # Escritura atómica: se escribe a un temporal y se renombra
+        fd, tmp_path = tempfile.mkstemp(dir=self.layout_dir, prefix=".tmp-")
+        with os.fdopen(fd, "w") as file:
+            file.write(text)
+        os.replace(tmp_path, self.path(key))
+
+    # Posiciones para el grafo: las guardadas se reutilizan tal cual, los nodos nuevos se
+    # acomodan con las posiciones existentes fijas y los nodos que ya no están se olvidan
+    def layout(self, key, graph, iterations=LAYOUT_ITERATIONS,
+               time_budget=LAYOUT_TIME_BUDGET, seed=LAYOUT_SEED, progress=None):
+        stored = self.load(key)
+        kept = {node: stored[node]
+                for node in graph.node_ids if node in stored}
+
+        if len(kept) == graph.num_nodes:
+            positions = kept
+        elif kept:
+            positions = compute_layout(graph, pos=kept, fixed=list(kept), iterations=iterations,
+                                       time_budget=time_budget, seed=seed, progress=progress)
+        else:
+            positions = compute_layout(graph, iterations=iterations,
+                                       time_budget=time_budget, seed=seed, progress=progress)
+
+        if len(positions) != len(stored) or len(kept) != len(stored):
+            try:
+                self.save(key, positions)
+            except (OSError, TypeError):
+                # Sin permisos de escritura o ids que no caben en JSON: no se guarda
+                pass
+
+        return positions
+
+
+default_store = None
+
+
+# Posiciones de los nodos usando el almacén compartido; key identifica al grafo (por
+# ejemplo la ruta del archivo) y si falta se usa su lista de nodos
+def node_layout(graph, key=None, iterations=LAYOUT_ITERATIONS, time_budget=LAYOUT_TIME_BUDGET,
+                progress=None):
+    global default_store
+
+    if key is None:
+        key = node_set_key(graph)
+
+    if default_store is None:
+        try:
+            default_store = LayoutStore()
+        except OSError:
+            return compute_layout(graph, iterations=iterations, time_budget=time_budget,
+                                  progress=progress)
+
+    return default_store.layout(key, graph, iterations=iterations, time_budget=time_budget,
+                                progress=progress)
@@ -0,0 +1,178 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from cargador import load_graph_file, EDGE_LIST_EXTENSIONS, BINARY_EXTENSIONS
+from cache_grafo import load_graph_cached
+from cache_mst import cached_mst
+import mst
+
+# Modo por lotes, sin interfaz gráfica: calcula el árbol de expansión mínima de muchos
+# archivos (JSON o listas de aristas) repartidos entre varios procesos.
+#
+#   python lote.py grafos/ "otros/*.json" -a boruvka -w distance -o resultados.csv
+
+# Extensiones que se buscan dentro de los directorios
+GRAPH_EXTENSIONS = (".json",) + EDGE_LIST_EXTENSIONS + BINARY_EXTENSIONS
+
+CSV_FIELDS = ("file", "algorithm", "nodes", "edges", "components", "tree_size", "total_weight",
+              "load_seconds", "mst_seconds", "error", "tree_edges")
+
+
+# Expande directorios (todos sus grafos, recursivamente) y patrones glob a una lista de archivos
+def find_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(file_path for file_path in
+                                glob.glob(os.path.join(path, "**", "*"), recursive=True)
+                                if file_path.lower().endswith(GRAPH_EXTENSIONS)))
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+
+# Trabajo de cada proceso: carga un archivo y calcula su árbol. Cada proceso lee su propio
+# archivo, así entre procesos solo viajan la ruta y el resultado. Con workers > 1 (un solo
+# archivo) el bosque se reparte por componentes entre procesos, también con el caché si el
+# árbol no estaba guardado
+def process_file(task):
+    file_path, algorithm, weight, cached, workers = task
+    result = {"file": file_path, "algorithm": algorithm}
+
+    try:
+        start = time.perf_counter()
+        if cached:
+            graph = load_graph_cached(file_path, weight=weight)
+            loaded = time.perf_counter()
+            tree, total_weight = cached_mst(graph, mst.ALGORITHMS[algorithm], workers=workers)
+        else:
+            graph = load_graph_file(file_path, weight=weight)
+            loaded = time.perf_counter()
+            tree, _ = mst.minimum_spanning_forest(graph, mst.ALGORITHMS[algorithm], workers)
+            total_weight = float(tree["weight"].sum())
+        finished = time.perf_counter()
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+        return result
+
+    node_ids = graph.node_ids
+    result.update({
+        "nodes": graph.num_nodes,
+        "edges": graph.num_edges,
+        # Un bosque tiene una arista menos que nodos por cada componente
+        "components": graph.num_nodes - len(tree),
+        "tree_size": len(tree),
+        "total_weight": total_weight,
+        "load_seconds": loaded - start,
+        "mst_seconds": finished - loaded,
+        "tree_edges": [[node_ids[u], node_ids[v], w] for u, v, w in tree.tolist()],
+    })
+    return result
+
+
+# Escribe los resultados a medida que llegan, sin juntarlos todos en memoria
+class JsonWriter:
+    def __init__(self, file):
+        self.file = file
+        self.count = 0
+        self.file.write("[")
+
+    def write(self, result):
+        self.file.write(",\n" if self.count else "\n")
+        self.file.write(json.dumps(result))
+        self.count += 1
+
+    def close(self):
+        self.file.write("\n]\n")
+
+
+class CsvWriter:
+    def __init__(self, file):
+        self.writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, result):
+        row = dict(result)
+        if "tree_edges" in row:
+            row["tree_edges"] = json.dumps(row["tree_edges"])
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+# Escribe un resultado y avisa por la salida de errores si falló; devuelve 1 si falló
+def write_result(writer, result):
+    writer.write(result)
+    if "error" in result:
+        print("%s: %s" % (result["file"], result["error"]), file=sys.stderr)
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcula el árbol de expansión mínima de muchos grafos sin interfaz gráfica.")
+    parser.add_argument("paths", nargs="+",
+                        help="archivos, directorios o patrones glob de grafos "
+                             "(JSON o listas de aristas)")
+    parser.add_argument("-a", "--algorithm", choices=sorted(mst.ALGORITHMS), default="prim")
+    parser.add_argument("-w", "--weight", default="weight",
+                        help="campo de peso preferido (weight, distance o peso); si las "
+                             "aristas no lo tienen se usa el que tengan")
+    parser.add_argument("-o", "--output", help="archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("-f", "--format", choices=("json", "csv"),
+                        help="formato de salida (por defecto, según la extensión de --output)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="cantidad de procesos")
+    parser.add_argument("--cache", action="store_true",
+                        help="usar los cachés en disco de grafos y de árboles ya calculados")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    files = find_files(args.paths)
+    if not files:
+        print("No se encontraron archivos de grafos.", file=sys.stderr)
+        return 1
+
+    output_format = args.format
+    if output_format is None:
+        output_format = "csv" if args.output and args.output.endswith(".csv") else "json"
+
+    workers = max(1, args.workers)
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = CsvWriter(output) if output_format == "csv" else JsonWriter(output)
+
+    errors = 0
+    try:
+        if len(files) == 1:
+            # Un solo archivo: los procesos se usan para sus componentes
+            errors += write_result(writer, process_file(
+                (files[0], args.algorithm, args.weight, args.cache, workers)))
+        else:
+            tasks = [(file_path, args.algorithm, args.weight, args.cache, 1)
+                     for file_path in files]
+            # Con chunksize=1 un archivo grande no retiene a otros detrás en el mismo proceso
+            with Pool(workers) as pool:
+                for result in pool.imap_unordered(process_file, tasks, chunksize=1):
+                    errors += write_result(writer, result)
+        writer.close()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
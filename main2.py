@@ -1,10 +1,14 @@
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QLabel, QFrame
 import sys
-import json
 import matplotlib.pyplot as plt
-import networkx as nx
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from grafo import GraphBuilder
+from cache_grafo import load_graph_cached
+from cargador import FILE_FILTER
+from layout import node_layout, file_key
+from render import MSTRenderer
+from tareas import TaskPanel
 
 
 class MinimumSpanningTreeTab(QWidget):
@@ -20,46 +24,37 @@ class MinimumSpanningTreeTab(QWidget):
 
         # Agregar el lienzo al diseño vertical
         self.layout.addWidget(self.canvas)
+        self.renderer = None
 
     def drawGraph(self, nodes, edges):
-        # Borrar el contenido de la figura antes de dibujar el grafo
-        self.figure.clear()
-
-        # Crear el grafo
-        graph = nx.Graph()
-
-        # Convertir los identificadores de nodos a cadenas
-        nodes = [str(node.get("id")) for node in nodes]
-
-        # Agregar los nodos al grafo
-        graph.add_nodes_from(nodes)
-
-        # Agregar las aristas al grafo y dibujar las conexiones con direcciones y pesos
-        for edge in edges:
-            source_node = str(edge.get("source"))
-            target_node = str(edge.get("target"))
-            weight = str(edge.get("weight", ""))
-
-            # Agregar la arista al grafo
-            graph.add_edge(source_node, target_node, weight=weight)
-
-        # Dibujar los nodos en la figura
-        pos = nx.spring_layout(graph)
-        nx.draw_networkx_nodes(graph, pos, node_color='lightblue')
-
-        # Dibujar las aristas (conexiones) en la figura con etiquetas de peso
-        nx.draw_networkx_edges(
-            graph, pos, edge_color='black', arrows=True, arrowstyle='->')
-        labels = nx.get_edge_attributes(graph, 'weight')
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=labels)
-
-        # Dibujar los identificadores de los nodos
-        node_labels = {node: node for node in graph.nodes}
-        nx.draw_networkx_labels(
-            graph, pos, labels=node_labels, font_color='black')
+        # Crear el grafo compacto desde las listas de nodos y aristas
+        builder = GraphBuilder("weight", default_weight=float("nan"))
+        builder.add_nodes(nodes)
+        builder.add_edges(edges)
+
+        self.showGraph(builder.build())
+
+    def showGraph(self, graph, layout_key=None):
+        # Posiciones de los nodos guardadas en disco y reutilizadas
+        pos = node_layout(graph, layout_key)
+        self.showLayout(graph, pos)
+
+    def showLayout(self, graph, pos):
+        # Dibujar nodos, aristas (una sola colección, sin flechas) y etiquetas de peso; en
+        # grafos grandes las etiquetas aparecen solo al acercarse con la rueda del mouse.
+        # Las aristas sin peso (NaN) no llevan etiqueta
+        self.clear()
+        self.renderer = MSTRenderer(self.figure, self.canvas, graph, pos,
+                                    node_color='lightblue', node_size=300, edge_color='black')
 
         # Actualizar el lienzo de la figura
-        self.canvas.draw()
+        self.renderer.draw()
+
+    def clear(self):
+        if self.renderer is not None:
+            self.renderer.disconnect()
+            self.renderer = None
+        self.figure.clear()
 
 
 class MainWindow(QMainWindow):
@@ -94,8 +89,15 @@ class MainWindow(QMainWindow):
         # Crear el layout principal donde se mostrara el grafo
         main_layout = QHBoxLayout()
 
+        # Avance y botón para cancelar la carga y el layout, debajo del grafo; los errores
+        # se muestran en un aviso
+        self.tasks = TaskPanel()
+        graph_layout = QVBoxLayout()
+        graph_layout.addWidget(self.graph_widget, 1)
+        graph_layout.addWidget(self.tasks)
+
         # Uso de factor de estiramiento para auto ajustar el tamaño del widget del grafo
-        main_layout.addWidget(self.graph_widget, 1)
+        main_layout.addLayout(graph_layout, 1)
         main_layout.addLayout(menu_layout)
 
         # Crear el widget central y establecer el layout principal
@@ -115,7 +117,7 @@ class MainWindow(QMainWindow):
 
     def reset_button_clicked(self):
         if self.graph_widget.figure.axes:  # Verificar si hay algún dibujo presente
-            self.graph_widget.figure.clear()  # Borrar el contenido de la figura
+            self.graph_widget.clear()  # Borrar el contenido de la figura
             self.graph_widget.canvas.draw()  # Actualizar el lienzo de la figura
             self.btn_reset.setEnabled(False)  # Desactivar el botón "Reset"
 
@@ -126,23 +128,30 @@ class MainWindow(QMainWindow):
         # Utilizar el diálogo de PyQt en lugar del nativo del sistema
         options |= QFileDialog.DontUseNativeDialog
 
-        file_filter = "JSON Files (*.json)"
+        file_filter = FILE_FILTER
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open JSON File", "", file_filter, options=options)
 
         if file_path:
-            # Cargar el archivo JSON
-            with open(file_path) as json_file:
-                data = json.load(json_file)
+            # La carga y el layout corren en segundo plano
+            self.tasks.run(self.load_file, self.show_layout, file_path, label="Loading")
+
+    # En el hilo de trabajo: carga incremental del JSON (o desde el caché binario) y
+    # posiciones de los nodos guardadas en disco
+    def load_file(self, file_path, progress):
+        graph = load_graph_cached(file_path, weight="weight", default_weight=float("nan"))
+        return graph, node_layout(graph, file_key(file_path), progress=progress)
 
-            # Obtener nodos y aristas del archivo JSON
-            nodes = data.get("nodes", [])
-            edges = data.get("edges", [])
+    def show_layout(self, result):
+        # Dibujar los nodos y conexiones en el GraphWidget
+        self.graph_widget.showLayout(*result)
 
-            # Dibujar los nodos y conexiones en el GraphWidget
-            self.graph_widget.drawGraph(nodes, edges)
+        self.btn_reset.setEnabled(True)
 
-            self.btn_reset.setEnabled(True)
+    # Cierra la ventana; una carga en curso se cancela antes de destruir su hilo
+    def closeEvent(self, event):
+        self.tasks.shutdown(wait=True)
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+from PyQt5.QtWidgets import QVBoxLayout, QWidget, QPushButton, QMessageBox, QHBoxLayout, QInputDialog
+from PyQt5.QtCore import Qt
+from layout import compute_layout
+from ventana import MSTWindow
+from dinamico import DynamicMST
+import mst
+from main import AlgorithPrim
+
+
+class GraphWindow(MSTWindow):
+    style = dict(node_color="gray", node_size=400, edge_color="black", tree_color="blue",
+                 source_color="red", target_color="blue")
+    native_dialog = False
+    # Pausa de 6 segundos entre pasos de la animación
+    step_delay = 6000
+    no_graph_message = "Datos del grafo no validos"
+    done_title = "Listo"
+    done_message = "Minimum Spanning Tree encontrado."
+
+    def __init__(self):
+        super().__init__()
+
+        self.AlgorithmPrim = AlgorithPrim()
+
+        self.setWindowTitle(
+            "Simulación de Algoritmo de Prim con Interfaz Gráfica")
+        self.setFixedSize(1000, 700)  # tamaño fijo de la ventana
+
+        # layour principal para el grafo
+        main_layout = QHBoxLayout()
+
+        # creación del layout para los botones
+        menu_layout = QVBoxLayout()
+
+        # alineación de los botones
+        menu_layout.setAlignment(Qt.AlignTop | Qt.AlignRight)
+
+        # creación de los botones
+        import_button = QPushButton("New Graph")
+        self.find_button = QPushButton("Find MST Prim")
+        self.kruskal_button = QPushButton("Find MST Kruskal")
+        self.reset_button = QPushButton("Reiniciar")
+        self.clear_button = QPushButton("Limpiar")
+        self.insert_button = QPushButton("Agregar arista")
+        self.delete_button = QPushButton("Quitar arista")
+        self.weight_button = QPushButton("Cambiar peso")
+
+        # conectar los botones con las funciones
+        import_button.clicked.connect(self.import_json)
+        self.find_button.clicked.connect(self.find_mst)
+        self.kruskal_button.clicked.connect(self.find_mst_kruskal)
+        self.reset_button.clicked.connect(self.reset_animation)
+        self.clear_button.clicked.connect(self.clear_graph)
+        self.insert_button.clicked.connect(self.ask_insert_edge)
+        self.delete_button.clicked.connect(self.ask_delete_edge)
+        self.weight_button.clicked.connect(self.ask_edge_weight)
+
+        menu_layout.addWidget(import_button)
+        menu_layout.addWidget(self.find_button)
+        menu_layout.addWidget(self.kruskal_button)
+        menu_layout.addWidget(self.reset_button)
+        menu_layout.addWidget(self.clear_button)
+        menu_layout.addWidget(self.insert_button)
+        menu_layout.addWidget(self.delete_button)
+        menu_layout.addWidget(self.weight_button)
+
+        # el grafo y, debajo, la barra para moverse a cualquier paso de la animación
+        graph_layout = QVBoxLayout()
+        graph_layout.addWidget(self.canvas, 1)
+        graph_layout.addWidget(self.make_slider())
+        graph_layout.addWidget(self.tasks)
+        main_layout.addLayout(graph_layout, 1)
+
+        # agregar el layout de los botones al layout principal
+        main_layout.addLayout(menu_layout)
+
+        self.central_widget = QWidget()
+        self.central_widget.setLayout(main_layout)
+        self.setCentralWidget(self.central_widget)
+
+    # el árbol editable se crea en la primera edición y se descarta con el árbol
+    def clear_tree(self):
+        super().clear_tree()
+        self.dynamic = None
+
+    def find_mst(self):
+        self.start_mst(mst.prim_mst)
+
+    def find_mst_kruskal(self):
+        self.start_mst(mst.kruskal_mst)
+
+    # limpiar el grafo
+    def clear_graph(self):
+        # un árbol que se esté calculando se descarta junto con el grafo
+        self.tasks.shutdown()
+        self.graph = None
+        if self.renderer is not None:
+            self.renderer.disconnect()
+            self.renderer = None
+        self.slider.setEnabled(False)
+        self.clear_tree()
+        self.node_positions = None
+        self.figure.clear()
+        self.canvas.draw()
+
+    # Edición del grafo: el árbol ya calculado se actualiza de forma incremental (reglas del
+    # ciclo y del corte en dinamico.DynamicMST) en lugar de recalcularse. Los nodos son ids
+    # del JSON; un id que no existe en insert_edge agrega un nodo nuevo
+    def insert_edge(self, source, target, weight):
+        self.edit_graph("insert_edge", source, target, weight)
+
+    def delete_edge(self, source, target):
+        self.edit_graph("delete_edge", source, target)
+
+    def set_edge_weight(self, source, target, weight):
+        self.edit_graph("set_weight", source, target, weight)
+
+    # la edición y el reacomodo de los nodos nuevos corren en segundo plano, como el resto
+    # de los cálculos; show_edit dibuja el resultado
+    def edit_graph(self, operation, *args):
+        tree = None if self.tree_parts is None else self.tree_array()
+        self.tasks.run(self.compute_edit, self.show_edit, self.dynamic, self.graph, tree,
+                       self.node_positions, operation, args, label="Editando",
+                       on_cancelled=self.discard_edit)
+
+    # en el hilo de trabajo: el árbol editable se crea en la primera edición
+    def compute_edit(self, dynamic, graph, tree, positions, operation, args, progress):
+        with self.profiler.stage("mst", operation=operation):
+            if dynamic is None:
+                dynamic = DynamicMST(graph, tree)
+            added, removed = getattr(dynamic, operation)(*args)
+            graph = dynamic.to_graph()
+
+        # una arista que salió y volvió a entrar (cambio de peso) se marca solo como agregada
+        removed = [e for e in removed if e not in added]
+        changes = dynamic.edges(added), dynamic.edges(removed)
+
+        # los nodos nuevos se acomodan junto a sus vecinos y los demás no se mueven
+        if graph.num_nodes > len(positions):
+            with self.profiler.stage("layout", nodes=graph.num_nodes - len(positions)):
+                positions = compute_layout(graph, pos=positions, fixed=list(positions),
+                                           progress=progress)
+        return dynamic, graph, positions, changes
+
+    def show_edit(self, result):
+        self.dynamic, self.graph, self.node_positions, changes = result
+
+        with self.profiler.stage("render"):
+            self.create_renderer()
+            if self.dynamic.tree is None:
+                self.renderer.draw()
+                return
+
+            # el árbol se dibuja completo y las aristas que entraron o salieron quedan
+            # marcadas con otro color
+            self.set_tree_array(self.dynamic.tree_edges())
+            last = self.tree_size - 1
+            self.renderer.set_tree(self.tree_array(), step=last, changes=changes)
+
+        self.slider.setRange(0, max(last, 0))
+        self.slider.setEnabled(True)
+        self.current_edge_index = last
+        self.completed = True
+        self.highlight_edges()
+
+    # una edición cancelada o con error pudo dejar a medias el árbol editable: se descarta y
+    # la próxima edición lo vuelve a crear desde el grafo y el árbol que se ven
+    def discard_edit(self):
+        self.dynamic = None
+
+    # traduce el texto de un nodo al id del grafo (los ids del JSON pueden ser números)
+    def parse_node(self, text):
+        node_ids = self.graph.node_ids
+        if text not in self.graph.index and text.lstrip("-").isdigit():
+            if int(text) in self.graph.index or node_ids and isinstance(node_ids[0], int):
+                return int(text)
+        return text
+
+    # pide "origen destino [peso]" y aplica la edición; los errores se muestran en un aviso
+    def ask_edge(self, title, with_weight, action):
+        # sin nodos no hay árbol que mantener ni ids de los que deducir el tipo
+        if self.graph is None or self.graph.num_nodes == 0 or self.tasks.busy:
+            QMessageBox.warning(self, "Error", "Datos del grafo no validos")
+            return
+
+        label = "origen destino peso:" if with_weight else "origen destino:"
+        text, accepted = QInputDialog.getText(self, title, label)
+        if not accepted:
+            return
+
+        parts = text.split()
+        try:
+            if len(parts) != (3 if with_weight else 2):
+                raise ValueError("Se esperaba: " + label[:-1])
+            args = [self.parse_node(parts[0]), self.parse_node(parts[1])]
+            if with_weight:
+                args.append(float(parts[2]))
+            action(*args)
+        except (ValueError, KeyError) as error:
+            QMessageBox.warning(self, "Error", str(error))
+
+    def ask_insert_edge(self):
+        self.ask_edge("Agregar arista", True, self.insert_edge)
+
+    def ask_delete_edge(self):
+        self.ask_edge("Quitar arista", False, self.delete_edge)
+
+    def ask_edge_weight(self):
+        self.ask_edge("Cambiar peso", True, self.set_edge_weight)
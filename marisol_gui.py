@@ -0,0 +1,47 @@
+from PyQt5.QtWidgets import QVBoxLayout, QWidget, QPushButton
+from ventana import TimedMSTWindow
+import mst
+
+
+class GraphWindow(TimedMSTWindow):
+    weight = "distance"
+    style = dict(node_color="lightblue", node_size=500, edge_color="gray",
+                 tree_color="green", tree_width=2, edge_labels=False)
+    done_message = "Boruvka's algorithm traversal completed."
+    # Cambia el valor (en milisegundos) según tu preferencia para la velocidad de la animación
+    step_interval = 1000
+
+    def __init__(self):
+        super().__init__()
+
+        self.setWindowTitle("Graph Viewer")
+        self.setGeometry(100, 100, 800, 600)
+
+        layout = QVBoxLayout()
+
+        layout.addWidget(self.canvas)
+
+        import_button = QPushButton("Import JSON")
+        import_button.clicked.connect(self.import_json)
+        layout.addWidget(import_button)
+
+        self.run_button = QPushButton("Run Boruvka's Algorithm")
+        self.run_button.clicked.connect(self.run_boruvka)
+        layout.addWidget(self.run_button)
+
+        self.pause_button = QPushButton("Pause/Resume")
+        self.pause_button.clicked.connect(self.pause_resume_animation)
+        layout.addWidget(self.pause_button)
+
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset_animation)
+        layout.addWidget(self.reset_button)
+
+        layout.addWidget(self.tasks)
+
+        self.central_widget = QWidget()
+        self.central_widget.setLayout(layout)
+        self.setCentralWidget(self.central_widget)
+
+    def run_boruvka(self):
+        self.start_mst(mst.boruvka_mst)
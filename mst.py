@@ -0,0 +1,343 @@
+import heapq
+from array import array
+from multiprocessing import Pool
+import numpy as np
+from grafo import EDGE
+
+# Todos los algoritmos trabajan sobre un grafo.CSRGraph y devuelven las aristas aceptadas
+# como arreglo estructurado grafo.EDGE (origen, destino, peso) con índices enteros de nodo,
+# en el orden en que se agregan al árbol. CSRGraph.label_edges las traduce a los ids del JSON.
+# Si el grafo no es conexo el resultado es un bosque de expansión mínima: un árbol por
+# componente conexa (ver también minimum_spanning_forest).
+#
+# Cada algoritmo tiene además una versión por pasos (prim_steps, boruvka_steps,
+# kruskal_steps): un generador que entrega cada paso apenas se decide, como lista de tuplas
+# (una arista en Prim y Kruskal, todas las de la ronda en Borůvka). Así la animación puede
+# empezar antes de que el árbol esté completo; las versiones *_mst juntan los pasos en el
+# arreglo.
+#
+# progress, si se pasa, se llama como progress(hechos, total) cada tanto (nodos agregados
+# o rondas de Borůvka); si lanza una excepción el cálculo se detiene, así se cancela.
+
+# Cada cuántos nodos agregados se informa el avance en Prim y Kruskal
+PROGRESS_INTERVAL = 4096
+
+
+# Algoritmo de Prim con una cola de prioridad (heap binario), O(E log V)
+def prim_steps(graph, progress=None):
+    # Si el grafo no tiene nodos no hay árbol que calcular
+    if graph.num_nodes == 0:
+        return
+
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+    edge_index = graph.edge_index
+    weights = graph.weights
+
+    # Nodos ya visitados, el menor peso conocido para llegar a cada nodo y desde qué nodo,
+    # en arreglos compactos (1, 8 y 4 bytes por nodo)
+    visited = bytearray(graph.num_nodes)
+    best = array("d", [float("inf")]) * graph.num_nodes
+    parent = array("i", [-1]) * graph.num_nodes
+    num_visited = 0
+
+    # Un árbol por componente: cuando la frontera se vacía, Prim vuelve a empezar desde el
+    # siguiente nodo sin visitar, así con un grafo no conexo el resultado es un bosque
+    root = 0
+    while num_visited < graph.num_nodes:
+        while visited[root]:
+            root += 1
+
+        # Frontera: (peso, destino), el origen queda en parent. Un destino se agrega solo
+        # cuando mejora best, así la primera vez que sale sin visitar es con su mejor arista
+        frontier = [(0.0, root)]
+
+        # Las aristas se recorren desde la adyacencia CSR, que guarda ambos sentidos,
+        # así que el grafo se trata como no dirigido
+        while frontier and num_visited < graph.num_nodes:
+            weight, target = heapq.heappop(frontier)
+
+            # Arista obsoleta: el destino ya entró al árbol por otra arista más barata
+            if visited[target]:
+                continue
+
+            visited[target] = 1
+            num_visited += 1
+            if progress is not None and num_visited % PROGRESS_INTERVAL == 0:
+                progress(num_visited, graph.num_nodes)
+            if parent[target] != -1:
+                yield [(parent[target], target, weight)]
+
+            start, end = offsets[target], offsets[target + 1]
+            for neighbor, neighbor_weight in zip(
+                    neighbors[start:end].tolist(), weights[edge_index[start:end]].tolist()):
+                if not visited[neighbor] and neighbor_weight < best[neighbor]:
+                    best[neighbor] = neighbor_weight
+                    parent[neighbor] = target
+                    heapq.heappush(frontier, (neighbor_weight, neighbor))
+
+
+def prim_mst(graph, progress=None):
+    return collect(prim_steps(graph, progress))
+
+
+# Junta los pasos en un arreglo EDGE sin pasar por una lista con todas las aristas
+def collect(steps):
+    return np.fromiter((edge for step in steps for edge in step), dtype=EDGE)
+
+
+# Arreglo EDGE con las aristas del grafo de índices edges
+def edge_records(graph, edges):
+    tree = np.empty(len(edges), dtype=EDGE)
+    tree["source"] = graph.sources[edges]
+    tree["target"] = graph.targets[edges]
+    tree["weight"] = graph.weights[edges]
+    return tree
+
+
+# Conjunto disjunto (union-find) con compresión de caminos y unión por rango
+class DisjointSet:
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, node):
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+
+        # Compresión de caminos: todos los nodos recorridos apuntan a la raíz
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+
+        return root
+
+    def union(self, a, b):
+        root_a = self.find(a)
+        root_b = self.find(b)
+
+        if root_a == root_b:
+            return False
+
+        # Unión por rango: el árbol más bajo cuelga del más alto
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+
+        return True
+
+
+# Algoritmo de Borůvka vectorizado, O(E log V): cada ronda son unas pocas pasadas de NumPy
+# sobre los arreglos de aristas, sin bucles de Python por arista. Entrega los índices de
+# las aristas agregadas en cada ronda
+def boruvka_rounds(graph, progress=None):
+    num_nodes = graph.num_nodes
+    num_edges = graph.num_edges
+
+    # Orden total de las aristas por (peso, índice): los empates se rompen por índice y así
+    # la arista más barata de cada componente es única y no se forman ciclos
+    order = np.lexsort((np.arange(num_edges), graph.weights))
+    rank = np.empty(num_edges, dtype=np.int64)
+    rank[order] = np.arange(num_edges)
+
+    # Etiqueta de componente de cada nodo: el índice de un nodo representante
+    labels = np.arange(num_nodes)
+    sources = graph.sources.astype(np.int64)
+    targets = graph.targets.astype(np.int64)
+
+    num_trees = 0
+    while True:
+        source_labels = labels[sources]
+        target_labels = labels[targets]
+
+        # Las aristas internas de una componente ya no sirven: se descartan para siempre
+        outgoing = source_labels != target_labels
+        if not outgoing.all():
+            sources, targets, rank = sources[outgoing], targets[outgoing], rank[outgoing]
+            source_labels, target_labels = source_labels[outgoing], target_labels[outgoing]
+        if len(rank) == 0:
+            break
+
+        # Mínimo segmentado: la arista de menor rango que sale de cada componente
+        cheapest = np.full(num_nodes, num_edges, dtype=np.int64)
+        np.minimum.at(cheapest, source_labels, rank)
+        np.minimum.at(cheapest, target_labels, rank)
+
+        components = np.flatnonzero(cheapest < num_edges)
+        best = cheapest[components]
+
+        # Cada componente apunta a la componente del otro extremo de su arista más barata
+        position = np.empty(num_edges, dtype=np.int64)
+        position[rank] = np.arange(len(rank))
+        edge = position[best]
+        other = np.where(source_labels[edge] == components, target_labels[edge],
+                         source_labels[edge])
+
+        pointer = np.arange(num_nodes)
+        pointer[components] = other
+
+        # Dos componentes que se eligen mutuamente forman un ciclo de largo 2; la de menor
+        # etiqueta queda como raíz. Luego se salta de puntero en puntero hasta la raíz
+        mutual = (pointer[other] == components) & (components < other)
+        pointer[components[mutual]] = components[mutual]
+        while True:
+            jumped = pointer[pointer]
+            if (jumped == pointer).all():
+                break
+            pointer = jumped
+        labels = pointer[labels]
+
+        # Una arista elegida por sus dos componentes se agrega una sola vez
+        added = order[np.unique(best)]
+        num_trees += len(added)
+
+        if progress is not None:
+            progress(num_trees, num_nodes - 1)
+        yield added
+
+
+def boruvka_steps(graph, progress=None):
+    for added in boruvka_rounds(graph, progress):
+        yield edge_records(graph, added).tolist()
+
+
+def boruvka_mst(graph, progress=None):
+    rounds = list(boruvka_rounds(graph, progress))
+    if not rounds:
+        return np.empty(0, dtype=EDGE)
+    return edge_records(graph, np.concatenate(rounds))
+
+
+# Algoritmo de Kruskal: un solo ordenamiento vectorizado de los pesos y uniones en un union-find
+def kruskal_steps(graph, progress=None):
+    num_accepted = 0
+
+    # Orden estable para que los empates respeten el orden de las aristas
+    order = np.argsort(graph.weights, kind="stable")
+
+    components = DisjointSet(graph.num_nodes)
+    for source, target, weight in zip(graph.sources[order].tolist(),
+                                      graph.targets[order].tolist(),
+                                      graph.weights[order].tolist()):
+        if components.union(source, target):
+            num_accepted += 1
+            if progress is not None and num_accepted % PROGRESS_INTERVAL == 0:
+                progress(num_accepted, graph.num_nodes - 1)
+            yield [(source, target, weight)]
+
+            # Un árbol de n nodos tiene n - 1 aristas
+            if num_accepted == graph.num_nodes - 1:
+                break
+
+
+def kruskal_mst(graph, progress=None):
+    return collect(kruskal_steps(graph, progress))
+
+
+# Versión por pasos de cada algoritmo
+STEPS = {
+    prim_mst: prim_steps,
+    boruvka_mst: boruvka_steps,
+    kruskal_mst: kruskal_steps,
+}
+
+# Algoritmos por nombre (opción -a de lote.py y exportar.py) y el nombre de cada uno (panel
+# de tareas de las ventanas)
+ALGORITHMS = {
+    "prim": prim_mst,
+    "boruvka": boruvka_mst,
+    "kruskal": kruskal_mst,
+}
+ALGORITHM_NAMES = {algorithm: name for name, algorithm in ALGORITHMS.items()}
+
+
+# Componentes conexas con uniones vectorizadas: cada arista cuelga la raíz mayor de sus
+# extremos de la menor y luego se salta de puntero en puntero hasta las raíces; se repite
+# hasta que ninguna arista une dos componentes. Devuelve (cantidad de componentes,
+# componente de cada nodo), numeradas 0..k-1 en el orden de su nodo de menor índice
+def connected_components(graph):
+    parent = np.arange(graph.num_nodes)
+    sources = graph.sources.astype(np.int64)
+    targets = graph.targets.astype(np.int64)
+
+    while True:
+        source_roots = parent[sources]
+        target_roots = parent[targets]
+
+        # Las aristas internas de una componente ya no unen nada: se descartan para siempre
+        outgoing = source_roots != target_roots
+        if not outgoing.any():
+            break
+        sources, targets = sources[outgoing], targets[outgoing]
+        source_roots, target_roots = source_roots[outgoing], target_roots[outgoing]
+
+        # Los punteros siempre van a un índice menor, así no se forman ciclos
+        np.minimum.at(parent, np.maximum(source_roots, target_roots),
+                      np.minimum(source_roots, target_roots))
+        while True:
+            jumped = parent[parent]
+            if (jumped == parent).all():
+                break
+            parent = jumped
+
+    roots, components = np.unique(parent, return_inverse=True)
+    return len(roots), components
+
+
+# Componentes con al menos esta cantidad de nodos se calculan en procesos aparte
+PARALLEL_MIN_NODES = 1 << 14
+
+
+# Trabajo de cada proceso: el árbol de una componente, con los índices de su subgrafo
+def component_mst(task):
+    algorithm, graph = task
+    return algorithm(graph)
+
+
+# Bosque de expansión mínima calculado por componente: con workers > 1 y al menos dos
+# componentes grandes, cada una se calcula en un proceso aparte sobre su propio subgrafo
+# mientras las chicas se calculan juntas en este proceso. Devuelve (arreglo EDGE agrupado
+# por componente, componente de cada nodo); dentro de cada componente las aristas quedan
+# en el orden del algoritmo
+def minimum_spanning_forest(graph, algorithm=prim_mst, workers=1, progress=None):
+    num_components, components = connected_components(graph)
+    sizes = np.bincount(components, minlength=num_components)
+    large = np.flatnonzero(sizes >= PARALLEL_MIN_NODES)
+
+    if workers <= 1 or len(large) < 2:
+        tree = np.asarray(algorithm(graph, progress), dtype=EDGE)
+    else:
+        is_large = np.zeros(num_components, dtype=bool)
+        is_large[large] = True
+        parts = [np.flatnonzero(components == component) for component in large.tolist()]
+        small = np.flatnonzero(~is_large[components])
+
+        trees = []
+        with Pool(min(workers, len(parts))) as pool:
+            # Los procesos empiezan con las componentes grandes mientras aquí se calculan
+            # las chicas
+            results = pool.imap(component_mst,
+                                [(algorithm, graph.subgraph(nodes)) for nodes in parts])
+            if len(small):
+                trees.append(global_edges(algorithm(graph.subgraph(small)), small))
+            done = len(small)
+            for nodes, part in zip(parts, results):
+                trees.append(global_edges(part, nodes))
+                done += len(nodes)
+                if progress is not None:
+                    progress(done, graph.num_nodes)
+        tree = np.concatenate(trees)
+
+    order = np.argsort(components[tree["source"]], kind="stable")
+    return tree[order], components
+
+
+# Traduce un arreglo EDGE con índices de un subgrafo a los índices del grafo completo
+def global_edges(tree, nodes):
+    tree = np.array(tree, dtype=EDGE)
+    tree["source"] = nodes[tree["source"]]
+    tree["target"] = nodes[tree["target"]]
+    return tree
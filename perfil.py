@@ -0,0 +1,132 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Medición por etapas (carga, layout, MST, dibujo): tiempo de reloj y pico de memoria con
+# tracemalloc. Se activa con variables de entorno:
+#
+#   SI_PROFILE=1 python v2.py                      muestra las etapas en la barra de estado
+#   SI_PROFILE_TRACE=traza.jsonl python v2.py      además escribe una línea JSON por etapa
+PROFILE_VAR = "SI_PROFILE"
+TRACE_VAR = "SI_PROFILE_TRACE"
+
+# Con el perfil apagado stage() devuelve siempre este mismo contexto vacío
+DISABLED = contextlib.nullcontext()
+
+
+class Profiler:
+    def __init__(self, enabled=False, trace_path=None, on_record=None):
+        self.enabled = enabled or trace_path is not None
+        self.trace_path = trace_path
+        self.on_record = on_record
+        # Última medición de cada etapa, en el orden en que aparecieron
+        self.last = {}
+        # Las etapas pueden correr a la vez en el hilo de la interfaz y en el de trabajo.
+        # active: etapas en curso -> si otra etapa se superpuso con ella
+        self.lock = threading.Lock()
+        self.active = {}
+
+        # tracemalloc solo ve lo que se reserva después de activarlo, por eso arranca aquí
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_environment(cls, on_record=None):
+        return cls(enabled=os.environ.get(PROFILE_VAR, "") not in ("", "0"),
+                   trace_path=os.environ.get(TRACE_VAR) or None, on_record=on_record)
+
+    def stage(self, name, **details):
+        if not self.enabled:
+            return DISABLED
+        return self.measure(name, details)
+
+    # Etapa de un generador (por ejemplo los pasos del árbol en el hilo de trabajo): seconds
+    # cuenta solo el tiempo dentro del generador, no el que pasa esperando al consumidor
+    def stage_steps(self, name, steps, **details):
+        if not self.enabled:
+            return steps
+        return self.measure_steps(name, steps, details)
+
+    @contextlib.contextmanager
+    def measure(self, name, details):
+        token, start_memory = self.begin()
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.end(token, start_memory, dict(stage=name, start=started, seconds=seconds,
+                                               **details))
+
+    def measure_steps(self, name, steps, details):
+        token, start_memory = self.begin()
+        started = time.time()
+        start = time.perf_counter()
+        seconds = 0.0
+        steps = iter(steps)
+        try:
+            while True:
+                resumed = time.perf_counter()
+                try:
+                    step = next(steps)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - resumed
+                yield step
+        finally:
+            if hasattr(steps, "close"):
+                steps.close()
+            self.end(token, start_memory, dict(stage=name, start=started, seconds=seconds,
+                                               wall_seconds=time.perf_counter() - start,
+                                               **details))
+
+    # reset_peak reinicia el pico de toda la traza: solo se llama si no hay otra etapa en
+    # curso, y una etapa que se superpone con otra no puede atribuirse el pico
+    def begin(self):
+        token = object()
+        with self.lock:
+            overlapped = bool(self.active)
+            for other in self.active:
+                self.active[other] = True
+            if not overlapped:
+                tracemalloc.reset_peak()
+            self.active[token] = overlapped
+            return token, tracemalloc.get_traced_memory()[0]
+
+    # Cierra la etapa y registra su medición; peak_bytes es None si se superpuso con otra
+    def end(self, token, start_memory, entry):
+        with self.lock:
+            peak = tracemalloc.get_traced_memory()[1]
+            overlapped = self.active.pop(token)
+        entry["peak_bytes"] = None if overlapped else max(0, peak - start_memory)
+        self.record(entry)
+
+    def record(self, entry):
+        with self.lock:
+            self.last[entry["stage"]] = entry
+            if self.trace_path is not None:
+                with open(self.trace_path, "a") as file:
+                    file.write(json.dumps(entry) + "\n")
+            summary = self.summary_text()
+
+        if self.on_record is not None:
+            self.on_record(summary)
+
+    def summary(self):
+        with self.lock:
+            return self.summary_text()
+
+    def summary_text(self):
+        return " | ".join("%s %.3f s, %s" % (name, entry["seconds"], memory_text(entry["peak_bytes"]))
+                          for name, entry in self.last.items())
+
+
+def memory_text(peak_bytes):
+    if peak_bytes is None:
+        return "memoria compartida"
+    return "%.1f MB" % (peak_bytes / 2**20)
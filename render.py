@@ -0,0 +1,387 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+from grafo import EDGE
+from mst import connected_components
+
+
+# Paleta de colores de nodo: cada nodo guarda solo el índice de su color actual
+BASE, SOURCE, TARGET = 0, 1, 2
+
+# Nivel de detalle: las etiquetas (un Text por nodo o por arista) son lo más caro de dibujar.
+# Solo se muestran si la vista contiene a lo sumo tantos nodos o aristas; al acercarse con la
+# rueda del mouse aparecen las de la zona visible
+NODE_LABEL_LIMIT = 300
+EDGE_LABEL_LIMIT = 150
+
+# Con más aristas que esto, las aristas que no son del árbol se dibujan como imagen (ver
+# EdgeRaster) y los nodos se achican
+RASTER_EDGE_LIMIT = 5000
+
+# Factor de acercamiento por cada paso de la rueda del mouse
+ZOOM_STEP = 1.25
+
+# Con un grafo no conexo el árbol de cada componente se pinta con su propio color: la
+# primera componente con tree_color y las demás con los colores de este mapa, en ciclo
+COMPONENT_COLORMAP = "tab10"
+
+
+# Aristas de un grafo denso como imagen: se dibujan con Agg fuera de pantalla solo cuando
+# cambia la vista o el tamaño del lienzo, y los demás redibujados (pasos, saltos del control
+# deslizante) copian la imagen en lugar de trazar miles de segmentos
+class EdgeRaster(AxesImage):
+    def __init__(self, ax, segments, color, width):
+        super().__init__(ax, interpolation="nearest", zorder=1)
+        self.segments = segments
+        self.color = color
+        self.width = width
+        self.view = None
+        self.set_data(np.zeros((1, 1, 4)))
+
+    def draw(self, renderer):
+        ax = self.axes
+        view = (ax.get_xlim(), ax.get_ylim(), int(round(ax.bbox.width)),
+                int(round(ax.bbox.height)), ax.figure.dpi)
+        if view != self.view and view[2] > 0 and view[3] > 0:
+            self.view = view
+            self.rasterize(*view)
+        super().draw(renderer)
+
+    def rasterize(self, xlim, ylim, width, height, dpi):
+        figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor="none")
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.add_collection(LineCollection(self.segments, colors=self.color,
+                                         linewidths=self.width, antialiaseds=False))
+        canvas.draw()
+        self.set_data(np.array(canvas.buffer_rgba()))
+        self.set_extent((*xlim, *ylim))
+
+
+# Dibuja el grafo y la animación del árbol de expansión mínima reutilizando los artistas.
+# Los nodos (scatter), las aristas y las aristas del árbol (LineCollection) y las etiquetas
+# se crean una sola vez (las etiquetas, recién cuando entran en la vista); cada paso de la
+# animación solo pinta la arista nueva y sus dos extremos sobre la imagen actual y la copia
+# a la pantalla con blitting
+class MSTRenderer:
+    def __init__(self, figure, canvas, graph, positions, node_color="gray", node_size=400,
+                 edge_color="black", edge_width=1, tree_color="blue", tree_width=1,
+                 source_color=None, target_color=None, edge_labels=True,
+                 node_label_limit=NODE_LABEL_LIMIT, edge_label_limit=EDGE_LABEL_LIMIT,
+                 component_colors=COMPONENT_COLORMAP, added_color="orange",
+                 removed_color="red"):
+        self.figure = figure
+        self.canvas = canvas
+        self.graph = graph
+
+        # En grafos grandes los nodos se achican para no tapar las aristas
+        if graph.num_nodes > node_label_limit:
+            node_size = max(4, node_size * node_label_limit / graph.num_nodes)
+        self.node_size = node_size
+        self.node_label_limit = node_label_limit
+        self.edge_label_limit = edge_label_limit if edge_labels else -1
+        self.tree_color = np.array(to_rgba(tree_color))
+        self.tree_width = tree_width
+        # Colores para el origen y el destino de cada arista agregada (None = no cambia)
+        self.palette = np.array([to_rgba(color or node_color)
+                                 for color in (node_color, source_color, target_color)])
+        self.recolor_source = source_color is not None
+        self.recolor_target = target_color is not None
+
+        # Posiciones como arreglo (n, 2) en el orden de los índices del CSRGraph
+        self.xy = np.array([positions[node] for node in graph.node_ids],
+                           dtype=np.float64).reshape(-1, 2)
+
+        self.figure.clear()
+        self.ax = self.figure.add_subplot()
+        self.ax.set_axis_off()
+
+        segments = np.stack((self.xy[graph.sources], self.xy[graph.targets]), axis=1)
+        if graph.num_edges > RASTER_EDGE_LIMIT:
+            self.edges = EdgeRaster(self.ax, segments, edge_color, edge_width)
+            self.ax.add_image(self.edges)
+        else:
+            self.edges = LineCollection(segments, colors=edge_color,
+                                        linewidths=edge_width, zorder=1)
+            self.ax.add_collection(self.edges)
+
+        self.node_state = np.full(graph.num_nodes, BASE, dtype=np.int8)
+        self.nodes = self.ax.scatter(self.xy[:, 0], self.xy[:, 1], s=node_size,
+                                     c=self.palette[self.node_state], zorder=2)
+
+        # Etiquetas creadas hasta ahora (índice de nodo o de arista -> Text) y las visibles.
+        # Las de peso se agrupan además por par de extremos para repintarlas sobre la arista
+        self.middles = segments.mean(axis=1)
+        self.node_labels = {}
+        self.edge_texts = {}
+        self.edge_labels = {}
+        self.visible_nodes = np.empty(0, dtype=np.int64)
+        self.visible_edges = np.empty(0, dtype=np.int64)
+
+        # Bosque: con más de una componente (y component_colors) cada arista del árbol toma el
+        # color de su componente; si no, todas usan tree_color
+        self.components = None
+        if component_colors is not None:
+            num_components, components = connected_components(graph)
+            if num_components > 1:
+                self.components = components
+                # Se saltan los colores del mapa parecidos a tree_color
+                colors = [to_rgba(color) for color in colormaps[component_colors].colors]
+                self.component_palette = np.array([self.tree_color] + [
+                    color for color in colors
+                    if np.abs(np.subtract(color, self.tree_color)[:3]).sum() >= 0.9])
+
+        # Aristas del árbol: una colección aparte que solo contiene las ya agregadas
+        self.set_timeline(np.empty((0, 2), dtype=np.int64))
+        self.tree_lines = LineCollection([], colors=self.tree_color, linewidths=tree_width,
+                                         zorder=1.5)
+        self.ax.add_collection(self.tree_lines)
+
+        # Aristas que cambiaron en una edición del grafo: las que entraron al árbol, más
+        # gruesas, y las que salieron, punteadas (ver set_tree)
+        self.added_lines = LineCollection([], colors=added_color, linewidths=tree_width + 2,
+                                          zorder=1.6)
+        self.removed_lines = LineCollection([], colors=removed_color, linewidths=tree_width + 1,
+                                            linestyles="dashed", zorder=1.6)
+        self.ax.add_collection(self.added_lines)
+        self.ax.add_collection(self.removed_lines)
+
+        # Artistas animados para pintar solo lo que cambia en cada paso
+        self.step_line = Line2D([], [], color=self.tree_color, linewidth=tree_width,
+                                animated=True)
+        self.step_nodes = self.ax.scatter([], [], s=node_size, animated=True)
+        self.ax.add_line(self.step_line)
+
+        # La imagen de las aristas no cuenta para los límites: se fijan con los nodos y ya no
+        # cambian solos (set_extent de la imagen los movería)
+        self.ax.update_datalim(self.xy)
+        self.ax.margins(0.1)
+        self.ax.autoscale_view()
+        self.ax.set_autoscale_on(False)
+        self.update_labels()
+        self.ax.callbacks.connect("xlim_changed", self.on_limits)
+        self.ax.callbacks.connect("ylim_changed", self.on_limits)
+
+        # Último paso dibujado (-1 = ninguno)
+        self.shown = -1
+
+        # Si el lienzo se redibuja completo (por ejemplo al cambiar de tamaño) las
+        # colecciones deben reflejar el estado de la animación
+        self.resize_id = self.canvas.mpl_connect("resize_event", self.on_resize)
+        self.scroll_id = self.canvas.mpl_connect("scroll_event", self.on_scroll)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self.resize_id)
+        self.canvas.mpl_disconnect(self.scroll_id)
+
+    def on_resize(self, event):
+        self.sync()
+
+    # Al acercarse, desplazarse o cambiar la vista de cualquier forma sigue un dibujo
+    # completo: las colecciones deben tener los pasos que solo se pintaron con blitting
+    def on_limits(self, ax):
+        self.update_labels()
+        self.sync()
+
+    # Acerca o aleja la vista alrededor del cursor
+    def on_scroll(self, event):
+        if event.inaxes is not self.ax:
+            return
+        scale = 1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata + (x0 - event.xdata) * scale,
+                         event.xdata + (x1 - event.xdata) * scale)
+        self.ax.set_ylim(event.ydata + (y0 - event.ydata) * scale,
+                         event.ydata + (y1 - event.ydata) * scale)
+        self.canvas.draw_idle()
+
+    # Muestra solo las etiquetas de los nodos y aristas dentro de la vista, y ninguna si son
+    # más que el límite; las que faltan se crean la primera vez que se necesitan
+    def update_labels(self):
+        (x0, y0), (x1, y1) = self.ax.viewLim.get_points()
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+
+        nodes = np.flatnonzero((self.xy[:, 0] >= x0) & (self.xy[:, 0] <= x1) &
+                               (self.xy[:, 1] >= y0) & (self.xy[:, 1] <= y1))
+        if len(nodes) > self.node_label_limit:
+            nodes = nodes[:0]
+        for node in np.setdiff1d(self.visible_nodes, nodes).tolist():
+            self.node_labels[node].set_visible(False)
+        for node in nodes.tolist():
+            self.node_label(node).set_visible(True)
+        self.visible_nodes = nodes
+
+        edges = np.flatnonzero((self.middles[:, 0] >= x0) & (self.middles[:, 0] <= x1) &
+                               (self.middles[:, 1] >= y0) & (self.middles[:, 1] <= y1))
+        if len(edges) > self.edge_label_limit:
+            edges = edges[:0]
+        for edge in np.setdiff1d(self.visible_edges, edges).tolist():
+            self.edge_texts[edge].set_visible(False)
+        for edge in edges.tolist():
+            self.edge_text(edge).set_visible(True)
+        self.visible_edges = edges
+
+    def node_label(self, node):
+        label = self.node_labels.get(node)
+        if label is None:
+            x, y = self.xy[node]
+            label = self.node_labels[node] = self.ax.text(
+                x, y, str(self.graph.node_ids[node]), ha="center", va="center", zorder=3)
+        return label
+
+    # Las aristas sin peso (NaN) llevan una etiqueta vacía
+    def edge_text(self, edge):
+        label = self.edge_texts.get(edge)
+        if label is None:
+            x, y = self.middles[edge]
+            weight = self.graph.weights[edge]
+            if weight == weight:
+                label = self.ax.text(x, y, "%g" % weight, ha="center", va="center", zorder=3,
+                                     bbox=dict(boxstyle="round", ec="white", fc="white"))
+            else:
+                label = self.ax.text(x, y, "", zorder=3)
+            self.edge_texts[edge] = label
+            u, v = int(self.graph.sources[edge]), int(self.graph.targets[edge])
+            self.edge_labels.setdefault((min(u, v), max(u, v)), []).append(label)
+        return label
+
+    # Define las aristas del árbol, en el orden en que se animan, y dibuja el paso step;
+    # recibe un arreglo EDGE con índices de nodo (como mst.py) o las aristas con ids del JSON
+    # (u, v) o (u, v, datos). changes, si se pasa, son las aristas (agregadas, quitadas) de
+    # una edición, que quedan marcadas hasta el próximo set_tree
+    def set_tree(self, tree_edges, step=-1, changes=((), ())):
+        self.set_timeline(self.edge_indices(tree_edges))
+        for lines, edges in zip((self.added_lines, self.removed_lines), changes):
+            tree = self.edge_indices(edges)
+            lines.set_segments(np.stack((self.xy[tree[:, 0]], self.xy[tree[:, 1]]), axis=1))
+        self.seek(step)
+        self.shown = step
+        self.draw()
+
+    # Agrega aristas al final del árbol mientras se sigue calculando; no dibuja nada, los
+    # pasos nuevos se muestran con show
+    def add_tree(self, tree_edges):
+        self.extend_timeline(self.edge_indices(tree_edges))
+
+    def edge_indices(self, tree_edges):
+        # Un arreglo EDGE ya tiene los índices de nodo: no hace falta traducir arista por arista
+        if isinstance(tree_edges, np.ndarray) and tree_edges.dtype == EDGE:
+            return np.stack((tree_edges["source"], tree_edges["target"]),
+                            axis=1).astype(np.int64)
+        index = self.graph.index
+        return np.array([(index[edge[0]], index[edge[1]]) for edge in tree_edges],
+                        dtype=np.int64).reshape(-1, 2)
+
+    # Línea de tiempo de la animación: el paso i cambia el color de dos nodos (eventos 2i y
+    # 2i + 1). Para cada evento se guarda el color anterior y el nuevo, así cualquier salto
+    # hacia adelante o hacia atrás solo aplica esas diferencias
+    def set_timeline(self, tree):
+        self.tree = np.empty((0, 2), dtype=np.int64)
+        self.tree_segments = np.empty((0, 2, 2))
+        self.tree_colors = np.empty((0, 4))
+        # Cantidad de aristas del árbol ya agregadas
+        self.tree_count = 0
+        self.node_state[:] = BASE
+        self.shown = -1
+
+        self.event_nodes = np.empty(0, dtype=np.int64)
+        self.event_before = np.empty(0, dtype=np.int8)
+        self.event_after = np.empty(0, dtype=np.int8)
+        # Colores de los nodos después del último paso de la línea de tiempo
+        self.final_state = self.node_state.copy()
+        self.extend_timeline(tree)
+
+    # Agrega pasos al final de la línea de tiempo sin recalcular los anteriores
+    def extend_timeline(self, tree):
+        nodes = tree.ravel()
+        before = np.empty(len(nodes), dtype=np.int8)
+        after = np.empty(len(nodes), dtype=np.int8)
+
+        changes = ((SOURCE if self.recolor_source else None),
+                   (TARGET if self.recolor_target else None))
+        state = self.final_state
+        for event, node in enumerate(nodes.tolist()):
+            before[event] = state[node]
+            color = changes[event & 1]
+            if color is not None:
+                state[node] = color
+            after[event] = state[node]
+
+        segments = np.stack((self.xy[tree[:, 0]], self.xy[tree[:, 1]]), axis=1)
+        self.tree = np.concatenate((self.tree, tree))
+        self.tree_segments = np.concatenate((self.tree_segments, segments))
+        if self.components is not None:
+            palette = self.component_palette
+            colors = palette[self.components[tree[:, 0]] % len(palette)]
+            self.tree_colors = np.concatenate((self.tree_colors, colors))
+        self.event_nodes = np.concatenate((self.event_nodes, nodes))
+        self.event_before = np.concatenate((self.event_before, before))
+        self.event_after = np.concatenate((self.event_after, after))
+
+    # Copia el estado actual a las colecciones (O(V + E), solo para dibujos completos)
+    def sync(self):
+        self.nodes.set_facecolor(self.palette[self.node_state])
+        self.tree_lines.set_segments(self.tree_segments[:self.tree_count])
+        if self.components is not None:
+            self.tree_lines.set_color(self.tree_colors[:self.tree_count])
+
+    def draw(self):
+        self.sync()
+        self.canvas.draw()
+
+    # Muestra el estado con las aristas 0..step del árbol ya agregadas
+    def show(self, step):
+        step = min(step, len(self.tree) - 1)
+
+        if step == self.shown + 1 and self.canvas.supports_blit:
+            self.paint_step(step)
+        elif step != self.shown:
+            self.seek(step)
+            self.draw()
+        self.shown = step
+
+    # Lleva los colores del paso mostrado al paso step aplicando solo los eventos que hay
+    # entre ambos, con asignaciones vectorizadas (en una asignación con índices repetidos
+    # NumPy deja el último valor, por eso hacia atrás se recorren los eventos al revés)
+    def seek(self, step):
+        if step > self.shown:
+            events = slice(2 * (self.shown + 1), 2 * (step + 1))
+            self.node_state[self.event_nodes[events]] = self.event_after[events]
+        elif step < self.shown:
+            events = slice(2 * (step + 1), 2 * (self.shown + 1))
+            self.node_state[self.event_nodes[events][::-1]] = self.event_before[events][::-1]
+
+        self.tree_count = step + 1
+
+    # Pinta solo la arista step y sus extremos encima de la imagen actual: O(1) por paso
+    def paint_step(self, step):
+        source, target = self.tree[step]
+        self.tree_count = step + 1
+        self.node_state[[source, target]] = self.event_after[2 * step:2 * step + 2]
+
+        self.step_line.set_data(self.xy[[source, target], 0], self.xy[[source, target], 1])
+        if self.components is not None:
+            self.step_line.set_color(self.tree_colors[step])
+        self.step_nodes.set_offsets(self.xy[[source, target]])
+        self.step_nodes.set_facecolor(self.palette[self.node_state[[source, target]]])
+
+        self.ax.draw_artist(self.step_line)
+        for label in self.edge_labels.get((min(source, target), max(source, target)), ()):
+            if label.get_visible():
+                self.ax.draw_artist(label)
+        self.ax.draw_artist(self.step_nodes)
+        for node in (source, target):
+            label = self.node_labels.get(node)
+            if label is not None and label.get_visible():
+                self.ax.draw_artist(label)
+        self.canvas.blit(self.ax.bbox)
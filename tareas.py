@@ -0,0 +1,238 @@
+import queue
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton, QMessageBox
+
+
+# Se lanza dentro del hilo desde el callback de avance para detener el cálculo
+class Cancelled(Exception):
+    pass
+
+
+# Hilo que corre function(*args, progress=...) fuera del hilo de la interfaz. El resultado,
+# el avance y los errores vuelven a la ventana por señales, que Qt entrega en su hilo
+class Worker(QThread):
+    progress = pyqtSignal(int, int)
+    result = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, function, args=(), parent=None):
+        super().__init__(parent)
+        self.function = function
+        self.args = args
+        self.stopped = False
+
+    def cancel(self):
+        self.stopped = True
+
+    def report(self, done, total):
+        if self.stopped:
+            raise Cancelled()
+        self.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.execute()
+        except Cancelled:
+            self.cancelled.emit()
+        except Exception as error:
+            # Cualquier error del cálculo se muestra en la ventana en lugar de perderse en el hilo
+            self.failed.emit("%s: %s" % (type(error).__name__, error))
+        else:
+            self.result.emit(result)
+
+    def execute(self):
+        return self.function(*self.args, progress=self.report)
+
+
+# Lotes de pasos que pueden esperar a la ventana; con el buffer lleno el cálculo se detiene
+# hasta que la ventana lo vacíe, así la memoria en tránsito no crece con el grafo
+STEP_BUFFER = 64
+
+# Un lote se entrega al juntar STEP_BATCH elementos o al pasar STEP_INTERVAL segundos desde
+# el anterior; el primer paso se entrega solo, para que la animación empiece enseguida
+STEP_BATCH = 4096
+STEP_INTERVAL = 0.05
+
+
+# Hilo para un generador: function(*args, progress=...) entrega pasos (listas) que se juntan
+# en lotes y se dejan en un buffer acotado. La señal steps avisa a la ventana, que toma los
+# lotes con take() en su hilo. Al agotarse el generador se emite result(None)
+class StepWorker(Worker):
+    steps = pyqtSignal()
+
+    def __init__(self, function, args=(), parent=None):
+        super().__init__(function, args, parent)
+        self.buffer = queue.Queue(STEP_BUFFER)
+
+    def execute(self):
+        batch = []
+        sent = float("-inf")
+        for step in self.function(*self.args, progress=self.report):
+            batch.extend(step)
+            if len(batch) >= STEP_BATCH or time.monotonic() - sent >= STEP_INTERVAL:
+                self.put(batch)
+                batch = []
+                sent = time.monotonic()
+        if batch:
+            self.put(batch)
+
+    # Espera lugar en el buffer sin dejar de atender la cancelación
+    def put(self, batch):
+        while True:
+            if self.stopped:
+                raise Cancelled()
+            try:
+                self.buffer.put(batch, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self.steps.emit()
+
+    # En el hilo de la interfaz: todos los elementos que hay en el buffer, en orden
+    def take(self):
+        items = []
+        while True:
+            try:
+                items.extend(self.buffer.get_nowait())
+            except queue.Empty:
+                return items
+
+
+# Barra de avance con botón de cancelar; corre una tarea a la vez y se oculta al terminar
+class TaskPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+        # Hilos ya descartados que siguen corriendo; se guardan hasta que terminen para que
+        # Qt no destruya un QThread en marcha
+        self.retired = set()
+        self.on_result = None
+        self.on_steps = None
+        self.on_cancelled = None
+
+        self.label = QLabel()
+        self.bar = QProgressBar()
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.label)
+        layout.addWidget(self.bar, 1)
+        layout.addWidget(self.cancel_button)
+        self.setLayout(layout)
+
+        # Oculto conserva su lugar: mostrarlo no achica el lienzo, que si no se redibujaría
+        # completo justo cuando empieza la animación
+        policy = self.sizePolicy()
+        policy.setRetainSizeWhenHidden(True)
+        self.setSizePolicy(policy)
+        self.hide()
+
+    @property
+    def busy(self):
+        return self.worker is not None
+
+    # Corre function(*args, progress=...) en un hilo y llama a on_result(resultado) en el hilo
+    # de la interfaz. Con on_steps, function es un generador de pasos (ver StepWorker) y
+    # on_steps(elementos) recibe los que van llegando; on_result recibe None al final.
+    # on_cancelled se llama si la tarea se cancela. Devuelve False si ya hay una tarea corriendo
+    def run(self, function, on_result, *args, label="", on_steps=None, on_cancelled=None):
+        if self.busy:
+            return False
+
+        self.worker = Worker(function, args) if on_steps is None else StepWorker(function, args)
+        self.on_result = on_result
+        self.on_steps = on_steps
+        self.on_cancelled = on_cancelled
+        if on_steps is not None:
+            self.worker.steps.connect(self.deliver_steps)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.result.connect(self.finish)
+        self.worker.failed.connect(self.fail)
+        self.worker.cancelled.connect(self.finish_cancelled)
+        self.worker.finished.connect(self.finish_thread)
+
+        self.label.setText(label)
+        # Sin avance informado todavía la barra se muestra como ocupada
+        self.bar.setRange(0, 0)
+        self.cancel_button.setEnabled(True)
+        self.show()
+        self.worker.start()
+        return True
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def finish_cancelled(self):
+        if self.current():
+            on_cancelled = self.on_cancelled
+            self.stop()
+            if on_cancelled is not None:
+                on_cancelled()
+
+    # Varios avisos pueden llegar juntos: el primero vacía el buffer y los demás no traen nada
+    def deliver_steps(self):
+        if not self.current():
+            return
+        items = self.worker.take()
+        if items:
+            self.on_steps(items)
+
+    def update_progress(self, done, total):
+        self.bar.setRange(0, max(total, 1))
+        self.bar.setValue(done)
+
+    # Cancela la tarea y libera el panel sin esperar a su hilo (una carga que no se puede
+    # cancelar sigue hasta el final, pero su resultado se descarta). Con wait, al cerrar la
+    # ventana, se espera a todos los hilos antes de que Qt los destruya
+    def shutdown(self, wait=False):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.stop()
+        if wait:
+            for worker in list(self.retired):
+                worker.wait()
+            self.retired.clear()
+
+    # Libera el panel sin bloquear la interfaz, así on_result puede lanzar otra tarea; el hilo
+    # se guarda hasta su señal finished
+    def stop(self):
+        self.retired.add(self.worker)
+        self.worker = None
+        self.hide()
+
+    # finished se emite justo antes de que el hilo termine: la espera es inmediata
+    def finish_thread(self):
+        worker = self.sender()
+        if worker in self.retired:
+            worker.wait()
+            self.retired.discard(worker)
+
+    # Las señales de un hilo ya descartado (por ejemplo tras shutdown) se ignoran
+    def current(self):
+        return self.worker is not None and self.sender() is self.worker
+
+    def finish(self, result):
+        if not self.current():
+            return
+        on_result = self.on_result
+        # Los últimos pasos pueden seguir en el buffer
+        if self.on_steps is not None:
+            self.deliver_steps()
+        self.stop()
+        on_result(result)
+
+    # Un error deja la ventana igual que una cancelación (por ejemplo, sin el árbol a medias)
+    def fail(self, message):
+        if not self.current():
+            return
+        on_cancelled = self.on_cancelled
+        self.stop()
+        if on_cancelled is not None:
+            on_cancelled()
+        QMessageBox.warning(self, "Error", message)
@@ -0,0 +1,107 @@
+import json
+import numpy as np
+import pytest
+from cargador import load_binary_edges, load_edge_list, load_graph, save_binary_edges
+
+# Trozos de pocos bytes, así cada archivo de prueba se corta en varios lugares (en medio de
+# comentarios, encabezados y números)
+CHUNK_SIZE = 8
+
+
+def edge_list(tmp_path, text, name="aristas.csv"):
+    path = tmp_path / name
+    path.write_bytes(text.encode())
+    return str(path)
+
+
+def edges(graph):
+    ids = graph.node_ids
+    return [(ids[u], ids[v], w) for u, v, w in zip(graph.sources.tolist(),
+                                                   graph.targets.tolist(),
+                                                   graph.weights.tolist())]
+
+
+@pytest.mark.parametrize("chunk_size", [1, CHUNK_SIZE, 1 << 20])
+def test_comments_header_and_crlf(tmp_path, chunk_size):
+    text = ("# lista de prueba\r\n"
+            "source,target,weight\r\n"
+            "1,2,0.5  # comentario al final\r\n"
+            "\r\n"
+            "# comentario en medio\r\n"
+            "2;3;1.5\r\n"
+            "3\t1\t2\r\n"
+            "  4   1   7e-1  \r\n")
+    graph = load_edge_list(edge_list(tmp_path, text), chunk_size=chunk_size)
+    assert graph.node_ids == [1, 2, 3, 4]
+    assert edges(graph) == [(1, 2, 0.5), (2, 3, 1.5), (3, 1, 2.0), (4, 1, 0.7)]
+
+
+def test_without_weights_uses_default(tmp_path):
+    graph = load_edge_list(edge_list(tmp_path, "1 2\n2 3\n"), default_weight=2.0,
+                           chunk_size=CHUNK_SIZE)
+    assert edges(graph) == [(1, 2, 2.0), (2, 3, 2.0)]
+
+
+# Un id de texto después de ids enteros vuelve a leer todo el archivo con ids de texto
+@pytest.mark.parametrize("chunk_size", [CHUNK_SIZE, 1 << 20])
+def test_text_ids_after_numeric_ids(tmp_path, chunk_size):
+    text = "1,2,1\n2,3,2\n3,4,3\n4,a,4\n1.5,2,5\n"
+    graph = load_edge_list(edge_list(tmp_path, text), chunk_size=chunk_size)
+    assert graph.node_ids == ["1", "1.5", "2", "3", "4", "a"]
+    assert edges(graph)[-2:] == [("4", "a", 4.0), ("1.5", "2", 5.0)]
+
+
+@pytest.mark.parametrize("chunk_size", [CHUNK_SIZE, 1 << 20])
+def test_wrong_column_count_reports_the_line(tmp_path, chunk_size):
+    text = "# comentario\n1,2,1\n2,3,2\n3,4\n"
+    with pytest.raises(ValueError, match="Línea 4"):
+        load_edge_list(edge_list(tmp_path, text), chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize("weight", ["nan", "inf", "-inf", "1e400", "x"])
+def test_non_finite_weight_reports_the_line(tmp_path, weight):
+    text = "1,2,1\n2,3,%s\n3,4,3\n" % weight
+    with pytest.raises(ValueError, match="Línea 2"):
+        load_edge_list(edge_list(tmp_path, text), chunk_size=CHUNK_SIZE)
+    with pytest.raises(ValueError, match="Línea 2"):
+        load_edge_list(edge_list(tmp_path, text.replace("3,4", "c,4")), chunk_size=CHUNK_SIZE)
+
+
+def test_binary_non_finite_weight(tmp_path):
+    path = str(tmp_path / "aristas.bin")
+    save_binary_edges(path, [0, 1], [1, 2], [1.0, np.nan])
+    with pytest.raises(ValueError, match="Registro 2"):
+        load_binary_edges(path)
+
+
+def json_file(tmp_path, text):
+    path = tmp_path / "grafo.json"
+    path.write_text(text)
+    return str(path)
+
+
+# Con trozos de pocos caracteres los números quedan cortados entre un trozo y el siguiente
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1 << 20])
+def test_json_stream_numbers_across_chunks(tmp_path, chunk_size):
+    data = {"nodes": [{"id": 10}, {"id": 2000}, {"id": "c"}],
+            "extra": {"lista": [1, 2.5, None], "texto": "x"},
+            "edges": [{"source": 10, "target": 2000, "weight": 123.456},
+                      {"source": 2000, "target": "c", "weight": -7e-3},
+                      {"source": "c", "target": 10, "weight": 100000}]}
+    graph = load_graph(json_file(tmp_path, json.dumps(data, indent=1)), chunk_size=chunk_size)
+    assert graph.node_ids == [10, 2000, "c"]
+    assert edges(graph) == [(e["source"], e["target"], e["weight"]) for e in data["edges"]]
+
+
+def test_json_non_finite_weight(tmp_path):
+    text = '{"edges": [{"source": 1, "target": 2, "weight": 1}, ' \
+           '{"source": 2, "target": 3, "weight": NaN}]}'
+    with pytest.raises(ValueError, match="Arista 2"):
+        load_graph(json_file(tmp_path, text), chunk_size=CHUNK_SIZE)
+
+
+# El peso por omisión lo elige quien llama: main2 usa NaN para las aristas sin etiqueta
+def test_json_default_weight_may_be_nan(tmp_path):
+    text = '{"edges": [{"source": 1, "target": 2}, {"source": 2, "target": 3, "weight": 4}]}'
+    graph = load_graph(json_file(tmp_path, text), default_weight=float("nan"))
+    assert np.isnan(graph.weights[0]) and graph.weights[1] == 4
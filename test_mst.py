@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+from grafo import CSRGraph, EDGE
+from dinamico import DynamicMST
+import cache_mst
+import mst
+
+ALGORITHMS = list(mst.ALGORITHMS.values())
+
+
+# Grafo aleatorio con pesos enteros chicos (muchos empates), lazos y aristas paralelas; con
+# pocos nodos por arista suele quedar no conexo
+def random_graph(rng, num_nodes, num_edges, max_weight):
+    sources = rng.integers(0, num_nodes, num_edges)
+    targets = rng.integers(0, num_nodes, num_edges)
+    weights = rng.integers(0, max_weight + 1, num_edges).astype(np.float64)
+    return CSRGraph(range(num_nodes), sources, targets, weights)
+
+
+# Peso de un bosque de expansión mínima por fuerza bruta: Kruskal con un union-find simple
+def reference_weight(graph):
+    parent = list(range(graph.num_nodes))
+
+    def find(node):
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    total = 0.0
+    for e in sorted(range(graph.num_edges), key=lambda e: graph.weights[e]):
+        u, v = find(int(graph.sources[e])), find(int(graph.targets[e]))
+        if u != v:
+            parent[u] = v
+            total += graph.weights[e]
+    return total
+
+
+# Las aristas del resultado existen en el grafo y forman un bosque que cubre cada componente
+def check_forest(graph, tree):
+    assert tree.dtype == EDGE
+    edges = set(zip(graph.sources.tolist(), graph.targets.tolist(), graph.weights.tolist()))
+    components = mst.DisjointSet(graph.num_nodes)
+    for u, v, w in tree.tolist():
+        assert (u, v, w) in edges or (v, u, w) in edges
+        assert components.union(u, v)
+
+    num_components, _ = mst.connected_components(graph)
+    assert len(tree) == graph.num_nodes - num_components
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_algorithms_agree(seed):
+    rng = np.random.default_rng(seed)
+    num_nodes = int(rng.integers(1, 60))
+    num_edges = int(rng.integers(0, 3 * num_nodes))
+    graph = random_graph(rng, num_nodes, num_edges, max_weight=int(rng.integers(0, 5)))
+
+    expected = reference_weight(graph)
+    for algorithm in ALGORITHMS:
+        tree = algorithm(graph)
+        check_forest(graph, tree)
+        assert tree["weight"].sum() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_empty_and_isolated_nodes(algorithm):
+    assert len(algorithm(CSRGraph([], [], [], []))) == 0
+    assert len(algorithm(CSRGraph(range(3), [], [], []))) == 0
+    # Solo lazos: ninguna arista entra al bosque
+    assert len(algorithm(CSRGraph(range(2), [0, 1], [0, 1], [1.0, 2.0]))) == 0
+
+
+# Los pasos de MSTCache.stream forman el mismo árbol que el algoritmo, y al terminar quedan en
+# el caché: la segunda vez salen de ahí. Con source_key (grafo cargado por el caché de
+# grafos) la clave es esa; sin ella, el hash del contenido calculado al final
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("source_key", [None, "archivo-weight-v4"])
+def test_stream_fills_cache(monkeypatch, algorithm, source_key):
+    monkeypatch.setattr(cache_mst, "STREAM_CHUNK", 7)
+    graph = random_graph(np.random.default_rng(0), 50, 120, max_weight=3)
+    graph.source_key = source_key
+    cache = cache_mst.MSTCache()
+
+    expected = algorithm(graph).tolist()
+    assert [edge for step in cache.stream(graph, algorithm) for edge in step] == expected
+    assert len(cache.memory) == 1
+    assert [edge for step in cache.stream(graph, algorithm) for edge in step] == expected
+    assert (graph.content_hash is None) == (source_key is not None)
+
+
+# Ediciones al azar (agregar, quitar y cambiar el peso de aristas, con nodos nuevos, lazos y
+# empates) sobre el árbol incremental: después de cada una el árbol es un bosque de
+# expansión mínima del grafo editado. Con partial el árbol inicial está incompleto y
+# DynamicMST lo completa
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("partial", [False, True])
+def test_dynamic_edits(seed, partial):
+    rng = np.random.default_rng(seed)
+    num_nodes = int(rng.integers(2, 40))
+    graph = random_graph(rng, num_nodes, int(rng.integers(0, 3 * num_nodes)), max_weight=4)
+    tree = ALGORITHMS[seed % len(ALGORITHMS)](graph)
+    dynamic = DynamicMST(graph, tree[:len(tree) // 2] if partial else tree)
+
+    for _ in range(30):
+        alive = np.flatnonzero(dynamic.alive[:dynamic.num_edges])
+        operation = int(rng.integers(3)) if len(alive) else 0
+        weight = float(rng.integers(0, 5))
+        if operation == 0:
+            # A veces un extremo es un nodo nuevo
+            source, target = rng.integers(0, dynamic.num_nodes + 2, 2).tolist()
+            dynamic.insert_edge(source, target, weight)
+        else:
+            e = int(rng.choice(alive))
+            source = dynamic.node_ids[dynamic.sources[e]]
+            target = dynamic.node_ids[dynamic.targets[e]]
+            if operation == 1:
+                dynamic.delete_edge(source, target)
+            else:
+                dynamic.set_weight(source, target, weight)
+
+        edited = dynamic.to_graph()
+        tree = dynamic.tree_edges()
+        check_forest(edited, tree)
+        assert tree["weight"].sum() == pytest.approx(mst.kruskal_mst(edited)["weight"].sum())
+
+
+# Con workers > 1 un árbol que no está en el caché se calcula por componente, y se guarda con
+# otra clave que el árbol en el orden del algoritmo
+def test_compute_with_workers_uses_the_forest(monkeypatch):
+    graph = random_graph(np.random.default_rng(1), 60, 40, max_weight=3)
+    calls = []
+    minimum_spanning_forest = mst.minimum_spanning_forest
+
+    def forest(graph, algorithm, workers, progress):
+        calls.append(workers)
+        return minimum_spanning_forest(graph, algorithm, 1, progress)
+
+    monkeypatch.setattr(mst, "minimum_spanning_forest", forest)
+    cache = cache_mst.MSTCache()
+    tree, total = cache.compute(graph, mst.kruskal_mst, workers=4)
+    assert calls == [4]
+    check_forest(graph, tree)
+    assert total == pytest.approx(reference_weight(graph))
+
+    cache.compute(graph, mst.kruskal_mst, workers=4)
+    assert calls == [4]
+    cache.compute(graph, mst.kruskal_mst)
+    assert calls == [4] and len(cache.memory) == 2
@@ -0,0 +1,68 @@
+import numpy as np
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from grafo import CSRGraph
+from render import MSTRenderer, SOURCE, TARGET
+import mst
+
+
+def path_renderer(num_nodes=12):
+    graph = CSRGraph(range(num_nodes), range(num_nodes - 1), range(1, num_nodes),
+                     np.arange(1.0, num_nodes))
+    positions = {node: (node, node % 3) for node in range(num_nodes)}
+    figure = Figure()
+    canvas = FigureCanvasAgg(figure)
+    renderer = MSTRenderer(figure, canvas, graph, positions, source_color="red",
+                           target_color="blue")
+    renderer.set_tree(graph.label_edges(mst.kruskal_mst(graph)))
+    return graph, canvas, renderer
+
+
+def scroll(canvas, renderer, button):
+    x, y = renderer.ax.transData.transform(renderer.xy.mean(axis=0))
+    event = MouseEvent("scroll_event", canvas, x, y, button=button)
+    canvas.callbacks.process("scroll_event", event)
+
+
+# Los pasos pintados con blitting deben seguir en el dibujo completo que sigue a un zoom
+def test_zoom_after_blitted_steps_keeps_the_tree():
+    graph, canvas, renderer = path_renderer()
+    assert canvas.supports_blit
+    for step in range(10):
+        renderer.show(step)
+    assert renderer.tree_count == 10
+    assert len(renderer.tree_lines.get_segments()) == 0
+
+    scroll(canvas, renderer, "up")
+    canvas.draw()
+
+    segments = renderer.tree_lines.get_segments()
+    assert len(segments) == 10
+    np.testing.assert_allclose(segments, renderer.tree_segments[:10])
+    colors = renderer.nodes.get_facecolor()
+    np.testing.assert_allclose(colors, renderer.palette[renderer.node_state])
+    assert set(renderer.node_state[renderer.tree[:10].ravel()]) <= {SOURCE, TARGET}
+
+
+def test_zoom_in_and_out_restores_the_view():
+    graph, canvas, renderer = path_renderer()
+    limits = renderer.ax.get_xlim(), renderer.ax.get_ylim()
+    scroll(canvas, renderer, "up")
+    assert renderer.ax.get_xlim() != limits[0]
+    scroll(canvas, renderer, "down")
+    np.testing.assert_allclose(renderer.ax.get_xlim(), limits[0])
+    np.testing.assert_allclose(renderer.ax.get_ylim(), limits[1])
+
+
+# Las aristas que cambiaron en una edición quedan marcadas hasta el siguiente set_tree
+def test_edit_changes_are_marked_until_the_next_tree():
+    graph, canvas, renderer = path_renderer()
+    tree = mst.kruskal_mst(graph)
+    renderer.set_tree(tree, step=len(tree) - 1, changes=(tree[-1:], tree[:2]))
+    np.testing.assert_allclose(renderer.added_lines.get_segments(), renderer.tree_segments[-1:])
+    np.testing.assert_allclose(renderer.removed_lines.get_segments(), renderer.tree_segments[:2])
+
+    renderer.set_tree(tree)
+    assert len(renderer.added_lines.get_segments()) == 0
+    assert len(renderer.removed_lines.get_segments()) == 0
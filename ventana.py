@@ -0,0 +1,339 @@
+import matplotlib.pyplot as plt
+from PyQt5.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QSlider
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from grafo import EDGE, graph_from_json
+from cache_grafo import load_graph_cached
+from cargador import FILE_FILTER
+from layout import node_layout, file_key
+from render import MSTRenderer
+from perfil import Profiler
+from tareas import TaskPanel
+from cache_mst import stream_mst
+import mst
+
+# Base de las ventanas de main_gui, funciona_gui, unir_gui, v2_gui y marisol_gui: carga del
+# archivo y layout en segundo plano, dibujo con MSTRenderer, cálculo del árbol por pasos
+# mientras se anima y perfil por etapas. Cada ventana arma sus botones y fija los atributos
+# de clase de abajo; la animación avanza un paso cada step_delay milisegundos
+class MSTWindow(QMainWindow):
+    # Los perfiles de las tareas en segundo plano llegan a la barra de estado por esta señal
+    status = pyqtSignal(str)
+
+    # Campo de peso de los archivos y colores del dibujo
+    weight = "weight"
+    style = dict(node_color="gray", node_size=400, edge_color="black", tree_color="blue")
+    # Diálogo de archivos del sistema o el de Qt
+    native_dialog = True
+    step_delay = 3000
+    no_graph_message = "No graph data available."
+    done_title = "Completed"
+    done_message = "Minimum Spanning Tree found."
+
+    def __init__(self):
+        super().__init__()
+
+        self.graph = None
+        self.renderer = None
+        self.node_positions = None
+        self.slider = None
+        # Se detiene con Pause/Resume en las ventanas que lo tienen
+        self.paused = False
+        self.clear_tree()
+
+        self.figure = plt.figure()
+        self.canvas = FigureCanvas(self.figure)
+
+        # Avance y botón para cancelar la carga, el layout y el cálculo del árbol
+        self.tasks = TaskPanel()
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.next_step)
+
+        # Tiempo y memoria de cada etapa en la barra de estado (con SI_PROFILE=1)
+        self.profiler = Profiler.from_environment()
+        if self.profiler.enabled:
+            self.status.connect(self.statusBar().showMessage)
+            self.profiler.on_record = self.status.emit
+
+    # Línea de tiempo: permite ir a cualquier paso, hacia adelante o hacia atrás
+    def make_slider(self):
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setEnabled(False)
+        self.slider.valueChanged.connect(self.seek_step)
+        return self.slider
+
+    # Olvida el árbol calculado (o a medio calcular) y la posición de la animación
+    def clear_tree(self):
+        self.algorithm = None
+        # Aristas del árbol con índices de nodo: arreglos EDGE en el orden en que llegan (se
+        # concatenan recién en tree_array) y cuántas hay
+        self.tree_parts = None
+        self.tree_size = 0
+        self.current_edge_index = 0
+        self.completed = False
+        # La animación llegó al último paso recibido y espera los que faltan calcular
+        self.waiting = False
+
+    def import_json(self):
+        options = QFileDialog.Options()
+        if not self.native_dialog:
+            options |= QFileDialog.DontUseNativeDialog
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import JSON", "", FILE_FILTER, options=options)
+
+        if file_path:
+            # La carga y el layout corren en segundo plano; los errores los muestra el panel
+            self.tasks.run(self.load_file, self.show_layout, file_path, label="Loading")
+        else:
+            QMessageBox.warning(self, "Error", "No file selected.")
+
+    def draw_graph(self, json_data):
+        with self.profiler.stage("load"):
+            graph = graph_from_json(json_data, weight=self.weight)
+        self.show_graph(graph)
+
+    # El layout corre en segundo plano; show_layout dibuja el grafo cuando termina
+    def show_graph(self, graph, layout_key=None):
+        self.tasks.run(self.layout_graph, self.show_layout, graph, layout_key, label="Layout")
+
+    # En el hilo de trabajo: carga incremental del JSON, o directo del caché binario si ya
+    # se abrió antes, y luego el layout
+    def load_file(self, file_path, progress):
+        with self.profiler.stage("load", file=file_path):
+            graph = load_graph_cached(file_path, weight=self.weight)
+        return self.layout_graph(graph, file_key(file_path), progress)
+
+    # En el hilo de trabajo: posiciones de los nodos, guardadas en disco para que el mismo
+    # grafo siempre se vea igual
+    def layout_graph(self, graph, layout_key, progress):
+        with self.profiler.stage("layout", nodes=graph.num_nodes, edges=graph.num_edges):
+            return graph, node_layout(graph, layout_key, progress=progress)
+
+    def show_layout(self, result):
+        # Grafo compacto (CSR) para los algoritmos; un grafo nuevo descarta el árbol anterior
+        self.graph, self.node_positions = result
+        self.clear_tree()
+
+        with self.profiler.stage("render"):
+            self.create_renderer()
+            self.renderer.draw()
+        if self.slider is not None:
+            self.slider.setEnabled(False)
+
+    # Los artistas del grafo se crean una sola vez y se reutilizan en la animación
+    def create_renderer(self):
+        if self.renderer is not None:
+            self.renderer.disconnect()
+        self.renderer = MSTRenderer(self.figure, self.canvas, self.graph, self.node_positions,
+                                    **self.style)
+
+    # Botón del algoritmo: la primera vez (o con otro algoritmo) calcula el árbol en segundo
+    # plano y la animación empieza con el primer paso; después sigue la animación
+    def start_mst(self, algorithm):
+        if self.graph is None:
+            QMessageBox.warning(self, "Error", self.no_graph_message)
+            return
+
+        if self.tree_parts is None or self.algorithm is not algorithm:
+            self.start_tree(algorithm)
+            return
+
+        if self.completed:
+            QMessageBox.information(self, self.done_title, self.done_message)
+            return
+
+        self.next_step()
+
+    # Los pasos llegan por add_steps mientras el algoritmo sigue calculando
+    def start_tree(self, algorithm):
+        if self.tasks.busy:
+            return
+        self.clear_tree()
+        self.algorithm = algorithm
+        self.tree_parts = []
+        self.waiting = True
+        with self.profiler.stage("render"):
+            self.renderer.set_tree([])
+        label = mst.ALGORITHM_NAMES.get(algorithm, algorithm.__name__).capitalize()
+        self.tasks.run(self.compute_steps, self.finish_tree, self.graph, algorithm, label=label,
+                       on_steps=self.add_steps, on_cancelled=self.discard_tree)
+
+    # En el hilo de trabajo: los pasos del algoritmo (o del caché) a medida que se deciden
+    def compute_steps(self, graph, algorithm, progress):
+        return self.profiler.stage_steps("mst", stream_mst(graph, algorithm, progress))
+
+    # Cada lote de pasos se convierte una sola vez a un arreglo EDGE; el dibujo toma los
+    # índices de nodo de sus columnas
+    def add_steps(self, steps):
+        tree = np.array(steps, dtype=EDGE)
+        self.tree_parts.append(tree)
+        self.tree_size += len(tree)
+        with self.profiler.stage("render", steps=len(tree)):
+            self.renderer.add_tree(tree)
+        if self.slider is not None:
+            self.slider.setRange(0, self.tree_size - 1)
+            self.slider.setEnabled(True)
+        # En pausa la animación sigue al reanudarla
+        if self.waiting and not self.paused:
+            self.waiting = False
+            self.continue_animation()
+
+    # Árbol recibido hasta ahora como un solo arreglo EDGE; las partes se concatenan una vez
+    # y quedan juntas para las siguientes llamadas
+    def tree_array(self):
+        if len(self.tree_parts) != 1:
+            self.tree_parts = [np.concatenate(self.tree_parts) if self.tree_parts
+                               else np.empty(0, dtype=EDGE)]
+        return self.tree_parts[0]
+
+    # Reemplaza el árbol por el arreglo EDGE tree (por ejemplo, después de editar el grafo)
+    def set_tree_array(self, tree):
+        self.tree_parts = [tree]
+        self.tree_size = len(tree)
+
+    # Llegaron los pasos que la animación esperaba
+    def continue_animation(self):
+        self.next_step()
+
+    # Ya no llegan más pasos: si la animación los esperaba, termina
+    def finish_tree(self, _):
+        if self.waiting and not self.paused:
+            self.waiting = False
+            self.next_step()
+
+    # Cálculo cancelado: el árbol a medias se descarta
+    def discard_tree(self):
+        self.timer.stop()
+        self.clear_tree()
+        self.renderer.set_tree([])
+        if self.slider is not None:
+            self.slider.setEnabled(False)
+
+    def next_step(self):
+        if self.tree_parts is None:
+            return
+
+        if self.current_edge_index >= self.tree_size:
+            # Faltan pasos por calcular: add_steps retoma la animación cuando lleguen
+            if self.tasks.busy:
+                self.waiting = True
+                return
+
+            self.current_edge_index = self.tree_size - 1
+            self.completed = True
+
+            QMessageBox.information(self, self.done_title, self.done_message)
+            return
+
+        self.highlight_edges()
+        self.current_edge_index += 1
+
+        # Pausa de step_delay milisegundos antes de la siguiente animación
+        QTimer.singleShot(self.step_delay, self.next_step)
+
+    def highlight_edges(self):
+        if self.tree_parts is None:
+            return
+
+        # Solo se pinta la arista nueva y sus extremos; saltos o retrocesos redibujan todo
+        with self.profiler.stage("step", step=self.current_edge_index):
+            self.renderer.show(self.current_edge_index)
+
+        # La barra sigue a la animación sin volver a llamar a seek_step
+        if self.slider is not None:
+            self.slider.blockSignals(True)
+            self.slider.setValue(self.current_edge_index)
+            self.slider.blockSignals(False)
+
+    # Salta a un paso de la animación desde la barra; usa la línea de tiempo ya calculada
+    def seek_step(self, step):
+        if self.tree_parts is None:
+            return
+
+        self.current_edge_index = step
+        self.completed = False
+        self.highlight_edges()
+
+    def reset_animation(self):
+        if self.tree_parts is None:
+            return
+
+        self.current_edge_index = 0  # Reinicia el índice de la arista
+        self.completed = False  # Reinicia la flag de completado
+        self.highlight_edges()  # Dibuja el grafo original
+
+    # Cierra la ventana; una tarea en curso se cancela antes de destruir su hilo
+    def closeEvent(self, event):
+        self.tasks.shutdown(wait=True)
+        self.timer.stop()
+        super().closeEvent(event)
+
+
+# Variante con QTimer: la animación corre sola cada step_interval milisegundos y se puede
+# pausar y reanudar (v2_gui y marisol_gui)
+class TimedMSTWindow(MSTWindow):
+    step_interval = 1000
+
+    def start_mst(self, algorithm):
+        if self.graph is None:
+            QMessageBox.warning(self, "Error", self.no_graph_message)
+            return
+
+        if self.tree_parts is None or self.algorithm is not algorithm:
+            self.start_tree(algorithm)
+            return
+
+        if self.completed:
+            QMessageBox.information(self, self.done_title, self.done_message)
+            return
+
+        self.highlight_edges()
+
+        if not self.timer.isActive():
+            self.timer.start(self.step_interval)
+
+    def continue_animation(self):
+        self.start_mst(self.algorithm)
+
+    def next_step(self):
+        if self.tree_parts is None:
+            return
+
+        if self.paused or self.completed:
+            return
+
+        self.current_edge_index += 1
+
+        if self.current_edge_index >= self.tree_size:
+            # Faltan pasos por calcular: add_steps retoma la animación cuando lleguen
+            if self.tasks.busy:
+                self.current_edge_index -= 1
+                self.waiting = True
+                self.timer.stop()
+                return
+
+            self.current_edge_index = self.tree_size - 1
+            self.completed = True
+            self.timer.stop()
+
+        self.highlight_edges()
+
+        if self.completed:
+            QMessageBox.information(self, self.done_title, self.done_message)
+
+    def pause_resume_animation(self):
+        if self.tree_parts is None or self.completed:
+            return
+
+        if self.paused:
+            self.paused = False
+            self.timer.start()
+        else:
+            self.paused = True
+            self.timer.stop()
+
+    def reset_animation(self):
+        super().reset_animation()
+        self.timer.stop()